@@ -0,0 +1,142 @@
+import argparse
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from model import CalculatorModel
+
+# headless batch runner, no tk import anywhere on this path
+# usage: python batch.py formulas.txt -j 8 > results.txt
+
+class TrackedVariables(dict):
+    # remembers which names a chunk read before writing them itself
+    # used for both variables and user functions
+    def __init__(self, base):
+        super().__init__(base)
+        self.written = set()
+        self.exposed = set()
+
+    def _note(self, key):
+        if key not in self.written: self.exposed.add(key)
+
+    def __contains__(self, key):
+        self._note(key)
+        return super().__contains__(key)
+
+    def __getitem__(self, key):
+        self._note(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self._note(key)
+        return super().get(key, default)
+
+    def __setitem__(self, key, value):
+        self.written.add(key)
+        super().__setitem__(key, value)
+
+def evaluate_line(model, line):
+    expr = line.strip()
+    # same trailing = fix as the controller
+    if expr.endswith('='): expr = expr.rstrip('=')
+    if not expr: return ""
+
+    model.expression = expr
+    model.has_result = False
+    result, error = model.evaluate()
+    return f"Error: {error}" if error else result
+
+def _new_model(use_degrees):
+    model = CalculatorModel()
+    model.use_degrees = use_degrees
+    return model
+
+# --- worker side ---
+
+_worker_model = None
+
+def _init_worker(use_degrees):
+    global _worker_model
+    _worker_model = _new_model(use_degrees)
+
+def _run_tracked(model, lines, variables, functions):
+    # (output, variable delta, function delta, names read before being written)
+    tv, tf = TrackedVariables(variables), TrackedVariables(functions)
+    model.variables, model.functions = tv, tf
+    out = [evaluate_line(model, line) for line in lines]
+    delta = {k: dict.__getitem__(tv, k) for k in tv.written}
+    fdelta = {k: dict.__getitem__(tf, k) for k in tf.written}
+    return out, delta, fdelta, (tv.exposed, tf.exposed)
+
+def _run_chunk(lines, base):
+    # speculative run from the initial state, parent checks it afterwards
+    return _run_tracked(_worker_model, lines, base, {})
+
+# --- parent side ---
+
+def _chunks(lines, size):
+    it = iter(lines)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk: return
+        yield chunk
+
+def evaluate_stream(lines, jobs=1, chunk_size=1000, use_degrees=True):
+    # one output line per input line, in input order
+    # assignments and ans carry over as if one model saw the whole stream
+    if jobs <= 1:
+        model = _new_model(use_degrees)
+        for line in lines: yield evaluate_line(model, line)
+        return
+
+    base = dict(_new_model(use_degrees).variables)
+    state, fstate = dict(base), {}
+    dirty, fdirty = set(), set()  # names whose value may differ from base
+    local = _new_model(use_degrees)
+
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(use_degrees,)) as pool:
+        chunks = _chunks(lines, chunk_size)
+        pending = deque()
+
+        # bounded window keeps memory flat
+        for chunk in islice(chunks, jobs * 4):
+            pending.append((chunk, pool.submit(_run_chunk, chunk, base)))
+
+        while pending:
+            chunk, fut = pending.popleft()
+            out, delta, fdelta, (exposed, fexposed) = fut.result()
+
+            if exposed & dirty or fexposed & fdirty:
+                # chunk read something an earlier chunk changed, redo it in order
+                out, delta, fdelta, _ = _run_tracked(local, chunk, state, fstate)
+
+            state.update(delta)
+            dirty.update(delta)
+            fstate.update(fdelta)
+            fdirty.update(fdelta)
+            yield from out
+
+            nxt = next(chunks, None)
+            if nxt is not None: pending.append((nxt, pool.submit(_run_chunk, nxt, base)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate calculator expressions, one per line.")
+    parser.add_argument('input', nargs='?', default='-', help="input file, '-' for stdin")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="lines per worker task")
+    parser.add_argument('--rad', action='store_true', help="use radians instead of degrees")
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    try:
+        out = sys.stdout
+        for i, res in enumerate(evaluate_stream(src, args.jobs, args.chunk_size, not args.rad), 1):
+            out.write(res + "\n")
+            if i % args.chunk_size == 0: out.flush()
+        out.flush()
+    finally:
+        if src is not sys.stdin: src.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from model import CalculatorModel
+
+# headless benchmarks for the evaluation pipeline, never imports tkinter
+# usage: python bench.py --save baseline.json
+#        python bench.py --compare baseline.json --threshold 0.1
+
+FUNCS = ('sin', 'cos', 'tan', 'log', 'ln', 'sqrt')
+VARS = ('a', 'b', 'c', 'x', 'y', 'z')
+
+# --- workloads ---
+
+def _num(rng): return str(rng.choice([rng.randint(1, 999), round(rng.uniform(1, 100), 3)]))
+
+def _deep_parens(rng, depth):
+    expr = _num(rng)
+    for _ in range(depth): expr = f"({expr}{rng.choice('+-*')}{_num(rng)})"
+    return expr
+
+def _long_chain(rng, length):
+    return rng.choice('+-*/').join(_num(rng) for _ in range(length)).replace('/0', '/1')
+
+def _nested_funcs(rng, depth):
+    expr = _num(rng)
+    for _ in range(depth): expr = f"{rng.choice(('sin', 'cos', 'sqrt'))}({expr}+{_num(rng)})"
+    return expr
+
+def _variable_heavy(rng, length):
+    return '+'.join(f"{rng.choice(VARS)}*{rng.choice(VARS)}" for _ in range(length))
+
+def _assignments(rng, length):
+    lines = []
+    for _ in range(length):
+        var = rng.choice(VARS)
+        lines.append(f"{var} = {rng.choice(VARS)}*{_num(rng)}+{rng.choice(FUNCS[:3])}({_num(rng)})")
+    return lines
+
+def make_workloads(size=200, seed=0):
+    # name -> list of expressions, same seed gives the same workload every run
+    rng = random.Random(seed)
+    return {
+        'deep_parens': [_deep_parens(rng, rng.randint(10, 40)) for _ in range(size)],
+        'long_chain': [_long_chain(rng, rng.randint(20, 80)) for _ in range(size)],
+        'nested_funcs': [_nested_funcs(rng, rng.randint(3, 12)) for _ in range(size)],
+        'variable_heavy': [_variable_heavy(rng, rng.randint(5, 30)) for _ in range(size)],
+        'assignments': _assignments(rng, size),
+    }
+
+def _fresh_model():
+    model = CalculatorModel()
+    for i, v in enumerate(VARS): model.variables[v] = float(i + 1)
+    return model
+
+# --- stages ---
+
+def _rhs(expr): return expr.split('=', 1)[1] if '=' in expr else expr
+
+def make_stages(model):
+    # name -> (prepare(expr) -> arg, run(arg)), prepare is outside the timed region
+    def run_evaluate(expr):
+        model.expression = expr; model.has_result = False
+        return model.evaluate()
+
+    return {
+        'tokenize': (_rhs, model._tokenize),
+        'to_rpn': (lambda e: model._tokenize(_rhs(e)), model._to_rpn),
+        'compile': (_rhs, lambda e: model._emit(model._build_ir(model._to_rpn(model._tokenize(e))), [])),
+        'eval_rpn': (lambda e: model.compile(_rhs(e)), model._eval_rpn),
+        'evaluate': (lambda e: e, run_evaluate),
+    }
+
+# --- measurement ---
+
+def _percentile(sorted_ns, q):
+    return sorted_ns[min(len(sorted_ns) - 1, int(q * len(sorted_ns)))]
+
+def measure(run, args, min_time=0.2):
+    # latency per call, repeats the arg list until min_time has passed
+    samples = []
+    start = time.perf_counter()
+    clock = time.perf_counter_ns
+    while True:
+        for arg in args:
+            t0 = clock()
+            run(arg)
+            samples.append(clock() - t0)
+        if time.perf_counter() - start >= min_time: break
+    samples.sort()
+    mean = statistics.fmean(samples)
+    return {
+        'ops_per_sec': 1e9 / mean if mean else 0.0,
+        'mean_us': mean / 1e3,
+        'p50_us': _percentile(samples, 0.50) / 1e3,
+        'p90_us': _percentile(samples, 0.90) / 1e3,
+        'p99_us': _percentile(samples, 0.99) / 1e3,
+        'calls': len(samples),
+    }
+
+def measure_allocations(run, args):
+    # peak bytes allocated inside one call, averaged over the arg list
+    peaks = []
+    tracemalloc.start()
+    try:
+        for arg in args:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            run(arg)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return statistics.fmean(peaks) if peaks else 0.0
+
+def _swallow(run):
+    def wrapped(arg):
+        try: run(arg)
+        except Exception: pass
+    return wrapped
+
+def run_suite(size=200, min_time=0.2, seed=0, only=None):
+    results = {}
+    for wname, exprs in make_workloads(size, seed).items():
+        model = _fresh_model()
+        for sname, (prepare, run) in make_stages(model).items():
+            if only and sname not in only: continue
+            # errors count as work too, stages keep going
+            args = [prepare(e) for e in exprs]
+            safe = _swallow(run)
+            safe(args[0])  # warm the compile cache
+            stats = measure(safe, args, min_time)
+            stats['alloc_bytes'] = measure_allocations(safe, args)
+            results[f"{wname}/{sname}"] = stats
+    return results
+
+# --- checks ---
+
+PREVIEW_CASES = ('1.5', '1.5+2', '12.25*3', '.5+.25', '2^3^2', 'sin(2)+cos(1)', '(1+2)*(3', 'a*b+c', 'sqrt(16)/4.5')
+
+def check_preview(exprs):
+    # typing one char at a time must preview the same as the whole text at once
+    from preview import LivePreview
+    model = _fresh_model()
+    mismatches = []
+    for expr in exprs:
+        typed = LivePreview(model)
+        for i in range(1, len(expr) + 1): got = typed.evaluate(expr[:i])
+        want = LivePreview(model).evaluate(expr)
+        if got != want: mismatches.append((expr, got, want))
+    return mismatches
+
+# --- baselines ---
+
+def compare(current, baseline, threshold):
+    # (key, old ops/s, new ops/s, change) for everything slower than threshold
+    regressions = []
+    for key, stats in current.items():
+        old = baseline.get(key)
+        if not old or not old['ops_per_sec']: continue
+        change = stats['ops_per_sec'] / old['ops_per_sec'] - 1
+        if change < -threshold: regressions.append((key, old['ops_per_sec'], stats['ops_per_sec'], change))
+    return regressions
+
+def print_table(results, out=sys.stdout):
+    out.write(f"{'benchmark':32} {'ops/s':>12} {'p50 us':>9} {'p90 us':>9} {'p99 us':>9} {'alloc B':>10}\n")
+    for key, s in results.items():
+        out.write(f"{key:32} {s['ops_per_sec']:12.0f} {s['p50_us']:9.2f} {s['p90_us']:9.2f} {s['p99_us']:9.2f} {s['alloc_bytes']:10.0f}\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the calculator evaluation pipeline.")
+    parser.add_argument('--size', type=int, default=200, help="expressions per workload")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per benchmark")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stage', action='append', help="only run these stages")
+    parser.add_argument('--save', help="write results as a baseline file")
+    parser.add_argument('--compare', help="baseline file to check against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown before flagging, 0.10 = 10%%")
+    parser.add_argument('--check-preview', action='store_true', help="check the live preview against a full parse, then exit")
+    args = parser.parse_args(argv)
+
+    if args.check_preview:
+        exprs = list(PREVIEW_CASES) + [_rhs(e) for w in make_workloads(args.size, args.seed).values() for e in w]
+        mismatches = check_preview(exprs)
+        for expr, got, want in mismatches[:20]: print(f"  {expr!r}: typed {got}, whole {want}")
+        print(f"{len(mismatches)} of {len(exprs)} previews differ when typed.")
+        return 1 if mismatches else 0
+
+    results = run_suite(args.size, args.min_time, args.seed, args.stage)
+    print_table(results)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f: json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f: baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions past {args.threshold:.0%}:")
+            for key, old, new, change in regressions: print(f"  {key}: {old:.0f} -> {new:.0f} ops/s ({change:+.1%})")
+            return 1
+        print(f"\nNo regressions past {args.threshold:.0%}.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
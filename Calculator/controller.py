@@ -1,14 +1,34 @@
-from model import CalculatorModel
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from model import CalculatorModel, CostBudget
 from view import CalculatorView
+from preview import LivePreview
+
+# wait this long after the last keystroke before previewing
+PREVIEW_DELAY_MS = 150
+# how often the ui checks on a running calculation
+POLL_MS = 20
+# anything bigger fails fast instead of freezing the window
+BUDGET = {'max_tokens': 10000, 'max_depth': 200, 'max_ops': 10000}
 
 class CalculatorController:
     # link logic to ui
-    def __init__(self, root):
-        self.model = CalculatorModel()
+    def __init__(self, root, history_path=None):
+        self.model = CalculatorModel(history_path)
+        self.model.budget = CostBudget(**BUDGET)
+        # evaluate runs off the tk thread, one at a time
+        self._worker = ThreadPoolExecutor(max_workers=1)
+        self._job = None
+        self._cancel = None
         self.view = CalculatorView(root, self)
         self.view.bind_global_keys("<Key>", self._handle_keypress)
+        self.view.update_history(self.model.history_log.recent(3))
+        self.preview = LivePreview(self.model)
+        self.live_preview = True
+        self._preview_job = None
         # mouse click to edit
-        self.view.expr.bind("<Button-1>", lambda e: self._set_edit_mode(True))
+        self.view.expr.bind("<Button-1>", lambda e: None if self._job else self._set_edit_mode(True))
 
     def get_button_command(self, text):
         if text == 'AC': return self.clear
@@ -21,27 +41,72 @@ class CalculatorController:
         else: return lambda: self.append_char(text)
 
     def append_char(self, char):
+        if self._job: return
         # sync model with view
         if self.view.get_expression_state() == 'normal':
             self.model.expression = self.view.get_expression()
 
         self.model.append_char(char)
         self.view.update_expression(self.model.expression)
+        self._schedule_preview()
 
     def toggle_degrees(self):
+        if self._job: return
         is_deg = self.model.toggle_degrees()
         self.view.update_deg_btn(is_deg)
         
+    def toggle_preview(self):
+        # previewing reads the model the worker is using
+        if self._job: return
+        self.live_preview = not self.live_preview
+        self.view.update_preview_btn(self.live_preview)
+        if self.live_preview: self._schedule_preview()
+        else:
+            self._cancel_preview()
+            if not self.model.has_result: self.view.update_result("")
+
+    def _schedule_preview(self):
+        # debounce, only the last keystroke in a burst gets evaluated
+        if not self.live_preview: return
+        self._cancel_preview()
+        self._preview_job = self.view.schedule(PREVIEW_DELAY_MS, self._refresh_preview)
+
+    def _cancel_preview(self):
+        if self._preview_job: self.view.cancel(self._preview_job)
+        self._preview_job = None
+
+    def _refresh_preview(self):
+        self._preview_job = None
+        # don't overwrite a real result, or touch the model mid calculation
+        if self.model.has_result or self._job: return
+        result, _ = self.preview.evaluate(self.view.get_expression())
+        self.view.update_preview(result or "")
+
     def switch_mode(self):
         # toggle simple/sci
         new_state = not self.view.is_sci
         self.view.toggle_sci_mode(new_state)
 
+    def open_plot(self):
+        if self._job: return
+        # numpy is only needed once someone actually plots
+        try: from plot import AdaptiveSampler
+        except ImportError:
+            self.view.update_result("Error: plotting needs numpy")
+            return
+        expr = self.view.get_expression().rstrip('=') if not self.model.has_result else self.model.history
+        span = 360 if self.model.use_degrees else 6.3
+        self.view.open_plot_window(AdaptiveSampler(self.model), expr or "sin(x)", (-span, span),
+                                   busy=lambda: self._job is not None)
+
     def show_full_history(self):
+        if self._job: return
         log = self.model.get_history()
         self.view.open_history_window(log)
 
     def calculate(self):
+        if self._job: return
+        self._cancel_preview()
         # sync before solving
         current_text = self.view.get_expression()
         
@@ -50,33 +115,74 @@ class CalculatorController:
             
         self.model.expression = current_text
         
-        result, error = self.model.evaluate()
+        self._cancel = threading.Event()
+        self._job = self._worker.submit(self._run_evaluate, self._cancel)
+        self.view.schedule(POLL_MS, self._poll_job)
+
+    def _run_evaluate(self, cancel):
+        # worker thread, model is left alone by the ui until this returns
+        self.model.cancel_event = cancel
+        try: return self.model.evaluate()
+        finally: self.model.cancel_event = None
+
+    def _poll_job(self, waited=0):
+        if not self._job.done():
+            # only show the spinner text for slow ones
+            if waited == POLL_MS * 5: self.view.update_preview("...")
+            self.view.schedule(POLL_MS, lambda: self._poll_job(waited + POLL_MS))
+            return
 
+        try:
+            result, error = self._job.result()
+        except Exception as e:
+            # evaluate itself blew up (a profiler hook, say), show it and hand the window back
+            self.view.update_result(f"Error: {e}")
+            return
+        finally:
+            cancelled = self._cancel.is_set()
+            self._job = self._cancel = None
+        if cancelled:
+            self.clear()
+            return
+        self._show_result(result, error)
+
+    def _show_result(self, result, error):
         if result is None and error is None: return
 
         if error:
             self.view.update_result(f"Error: {error}")
         else:
             self.view.update_result(result)
-            self.view.update_history(self.model.history_log) 
+            self.view.update_history(self.model.history_log.recent(3))
         
         self.view.update_expression(self.model.history + "=")
         self._set_edit_mode(False)
 
     def clear(self):
+        # AC while busy stops the calculation, the poll clears once it has
+        if self._job:
+            self._cancel.set()
+            return
+        self._cancel_preview()
         self.model.clear()
         self.view.update_expression("")
         self.view.update_result("")
         self._set_edit_mode(False)
 
     def cycle_history(self, direction):
+        if self._job: return
         text = self.model.cycle_up() if direction == 'up' else self.model.cycle_down()
-        if text is not None: self.view.update_expression(text)
+        if text is not None:
+            self.view.update_expression(text)
+            self._schedule_preview()
 
     def _handle_keypress(self, event):
         is_editing = self.view.get_expression_state() == 'normal'
         k = event.keysym
 
+        # only Escape gets through while a calculation is running
+        if self._job and k != 'Escape': return "break"
+
         if k in ('Return', 'equal'):
             self.calculate()
             return "break"
@@ -100,14 +206,20 @@ class CalculatorController:
 
         if is_editing:
             # standard typing
-            if k in ('BackSpace', 'Delete', 'Home', 'End'): return
-            if event.char and event.char in "0123456789.()+-*/%^abcdefghijklmnopqrstuvwxyz=": return
+            # entry applies the edit first, preview fires after the debounce
+            if k in ('BackSpace', 'Delete', 'Home', 'End'):
+                self._schedule_preview()
+                return
+            if event.char and event.char in "0123456789.()+-*/%^abcdefghijklmnopqrstuvwxyz=,":
+                self._schedule_preview()
+                return
             return "break"
         
         elif k == 'BackSpace':
             self.model.backspace()
             self.view.update_expression(self.model.expression)
-        elif event.char and event.char in "0123456789.()+-*/%^abcdefghijklmnopqrstuvwxyz=":
+            self._schedule_preview()
+        elif event.char and event.char in "0123456789.()+-*/%^abcdefghijklmnopqrstuvwxyz=,":
             self.append_char(event.char)
 
     def _set_edit_mode(self, active):
@@ -0,0 +1,145 @@
+import json
+import os
+import time
+from array import array
+from collections import deque, namedtuple
+from collections.abc import Sequence
+
+HistoryEntry = namedtuple('HistoryEntry', 'expression result timestamp degrees')
+
+def _display(entry): return f"{entry.expression} = {entry.result}"
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class HistoryStore(Sequence):
+    # append-only history, one json record per line
+    # without a path it's just the ring buffer (old MAX_HISTORY behaviour)
+    def __init__(self, path=None, recent=50):
+        self.path = path
+        self.persistent = path is not None
+        self._recent = deque(maxlen=recent)
+
+        # byte offset of every record, nothing else kept in memory
+        self._offsets = array('Q')
+        # trigram -> record ids, built on first search
+        self._index = None
+        self._reader = self._writer = None
+
+        if self.persistent: self._open()
+
+    def _open(self):
+        if not os.path.exists(self.path): open(self.path, 'ab').close()
+        pos = end = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                pos += len(line)
+                # a line without newline is a torn write, it gets cut off below
+                if not line.endswith(b"\n"): break
+                # one json object per line, anything else (a torn write from an older version) is skipped
+                # checked by shape, decoding every record would undo the lazy start
+                body = line.strip()
+                if body.startswith(b"{") and body.endswith(b"}"): self._offsets.append(end)
+                end = pos
+
+        # cut a torn write back to the last complete record, so the next one starts clean
+        if end < pos:
+            with open(self.path, 'r+b') as f: f.truncate(end)
+        self._writer = open(self.path, 'ab')
+        self._reader = open(self.path, 'rb')
+
+        # only the tail gets decoded up front
+        n = len(self._offsets)
+        for i in range(max(0, n - self._recent.maxlen), n): self._recent.append(self._read(i))
+
+    def _decode(self, line):
+        d = json.loads(line)
+        return HistoryEntry(d['expr'], d['res'], d['ts'], d['deg'])
+
+    def _read(self, i):
+        self._reader.seek(self._offsets[i])
+        return self._decode(self._reader.readline())
+
+    def _index_entry(self, i, entry):
+        for gram in _trigrams(_display(entry)):
+            ids = self._index.get(gram)
+            if ids is None: ids = self._index[gram] = array('I')
+            ids.append(i)
+
+    def _build_index(self):
+        self._index = {}
+        with open(self.path, 'rb') as f:
+            for i, offset in enumerate(self._offsets):
+                f.seek(offset)
+                self._index_entry(i, self._decode(f.readline()))
+
+    def append(self, expression, result, degrees=True):
+        entry = HistoryEntry(expression, result, time.time(), degrees)
+        if not self.persistent:
+            self._recent.append(entry)
+            return entry
+
+        offset = self._writer.tell()
+        line = json.dumps({'expr': expression, 'res': result, 'ts': entry.timestamp, 'deg': degrees})
+        self._writer.write(line.encode('utf-8') + b"\n")
+        self._writer.flush()
+
+        i = len(self._offsets)
+        self._offsets.append(offset)
+        if self._index is not None: self._index_entry(i, entry)
+        self._recent.append(entry)
+        return entry
+
+    def __len__(self):
+        return len(self._offsets) if self.persistent else len(self._recent)
+
+    def record(self, i):
+        n = len(self)
+        if i < 0: i += n
+        if not 0 <= i < n: raise IndexError("history index out of range")
+
+        # recent entries come from memory, older ones from disk
+        start = n - len(self._recent)
+        if i >= start: return self._recent[i - start]
+        return self._read(i)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice): return [self[j] for j in range(*i.indices(len(self)))]
+        return _display(self.record(i))
+
+    def recent(self, n):
+        return [_display(e) for e in list(self._recent)[-n:]] if n > 0 else []
+
+    def search(self, text, prefix=False, limit=None):
+        # ids of matching entries, newest first
+        if not text: return []
+        match = (lambda s: s.startswith(text)) if prefix else (lambda s: text in s)
+
+        if self.persistent and len(text) >= 3:
+            if self._index is None: self._build_index()
+            postings = sorted((self._index.get(g, ()) for g in _trigrams(text)), key=len)
+            candidates = set(postings[0])
+            for ids in postings[1:]:
+                if not candidates: break
+                candidates.intersection_update(ids)
+            candidates = sorted(candidates, reverse=True)
+        else:
+            candidates = range(len(self) - 1, -1, -1)
+
+        found = []
+        for i in candidates:
+            if match(self[i]):
+                found.append(i)
+                if limit and len(found) >= limit: break
+        return found
+
+    def clear(self):
+        self._recent.clear()
+        if not self.persistent: return
+        self._writer.truncate(0); self._writer.seek(0)
+        self._offsets = array('Q'); self._index = None
+
+    def close(self):
+        for f in (self._reader, self._writer):
+            if f: f.close()
+        self._reader = self._writer = None
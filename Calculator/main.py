@@ -1,3 +1,4 @@
+import os
 import tkinter as tk
 from controller import CalculatorController
 
@@ -10,5 +11,5 @@ if __name__ == '__main__':
     main_window.resizable(False, False)
     
     # start the app
-    app = CalculatorController(main_window)
+    app = CalculatorController(main_window, os.path.join(os.path.expanduser("~"), ".calculator_history.jsonl"))
     main_window.mainloop()
\ No newline at end of file
@@ -1,17 +1,111 @@
+import json
 import math
+import operator
 import re
+from time import perf_counter
+from collections import OrderedDict, namedtuple
+
+from history import HistoryStore
+from reactive import DependencyGraph
+from profiling import Profiler
 
 class CalculatorError(Exception):
     pass
 
+# typed tokens
+NUM, NAME, FUNC, OP, LPAREN, RPAREN, ASSIGN, UFUNC, COMMA = range(9)
+Token = namedtuple('Token', 'kind value')
+
+# ir nodes
+Num = namedtuple('Num', 'value')
+Var = namedtuple('Var', 'name')
+BinOp = namedtuple('BinOp', 'op left right')
+Call = namedtuple('Call', 'func arg')
+Arg = namedtuple('Arg', 'index')
+UserCall = namedtuple('UserCall', 'name args')
+
+# compiled program opcodes
+PUSH, LOAD, BINARY, CALL, ARG, UCALL = range(6)
+
+# a word straight before '(' is a call, the one char lookahead keeps preview resumes safe
+TOKEN_RE = re.compile(r"(\d*\.?\d+)|([a-z]+)(?=\()|([a-z]+)|([+\-*/%^])|([()=,])")
+FUNC_DEF_RE = re.compile(r"([a-z]+)\(\s*([a-z]+(?:\s*,\s*[a-z]+)*)?\s*\)")
+
+def _call(stage, fn, *args): return fn(*args)
+
+def _div(a, b):
+    if b == 0: raise ZeroDivisionError("Division by zero")
+    return a / b
+
+class CostBudget:
+    # limits for runaway input, None = unlimited
+    def __init__(self, max_tokens=None, max_depth=None, max_ops=None):
+        self.max_tokens = max_tokens
+        self.max_depth = max_depth
+        self.max_ops = max_ops
+
+    def check_tokens(self, tokens):
+        if self.max_tokens is not None and len(tokens) > self.max_tokens:
+            raise CalculatorError(f"Expression too long ({len(tokens)} tokens)")
+        if self.max_depth is None: return
+        depth = 0
+        for t in tokens:
+            if t.kind == LPAREN:
+                depth += 1
+                if depth > self.max_depth: raise CalculatorError("Expression nested too deeply")
+            elif t.kind == RPAREN: depth -= 1
+
+    def check_ops(self, ops):
+        if self.max_ops is not None and ops > self.max_ops:
+            raise CalculatorError("Expression too expensive")
+
+class LRUCache:
+    # bounded lru, used for compiled expressions and function memos
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._store = OrderedDict()
+
+    def get(self, key):
+        value = self._store.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._store.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._store[key] = value
+        self._store.move_to_end(key)
+        if len(self._store) > self.maxsize: self._store.popitem(last=False)
+
+    def clear(self):
+        self._store.clear(); self.hits = 0; self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._store), 'maxsize': self.maxsize}
+
+class UserFunction:
+    # f(x, y) = body, compiled once per angle mode and called by name at run time
+    def __init__(self, name, params, body, memo_size=0):
+        self.name = name
+        self.params = tuple(params)
+        self.body = body
+        self.programs = {}  # use_degrees -> program
+        self.pure = False   # no variables or other functions read, set on compile
+        self.memo = LRUCache(memo_size) if memo_size else None
+
 class CalculatorModel:
-    def __init__(self):
+    def __init__(self, history_path=None):
         self.expression = ""
         self.history = ""
         self.has_result = False
         
         # order of operations
         self.precedence = {'+': 1, '-': 1, '*': 2, '/': 2, '%': 2, '^': 3}
+        self.binary = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': _div, '%': operator.mod, '^': math.pow}
         
         # function lookup table
         self.ops = {
@@ -23,129 +117,495 @@ class CalculatorModel:
             'sqrt': math.sqrt
         }
         
-        self.history_log = []
-        self.MAX_HISTORY = 50 # increased from 10
+        self.MAX_HISTORY = 50 # increased from 10, now the in-memory ring size
+        # pass a path to keep history across sessions
+        self.history_log = HistoryStore(history_path, self.MAX_HISTORY)
         self.cycle_index = -1 
         
         self.use_degrees = True 
-        self.variables = {'pi': math.pi, 'e': math.e, 'ans': 0.0}
+        # constants get folded at compile time so they can't be reassigned
+        self.constants = {'pi': math.pi, 'e': math.e}
+        self.variables = {'ans': 0.0}
+        # user defined functions by name, see define_function
+        self.functions = {}
+        self.MAX_CALL_DEPTH = 100
+        self.FUNCTION_MEMO = 256 # results kept per pure function
+
+        # reactive STO keeps each definition and recomputes dependents on change
+        self.reactive = False
+        self.definitions = {}
+        self.graph = DependencyGraph()
+
+        # compiled programs per expression string
+        self.cache = LRUCache()
+        self._np_ops = None
+
+        # opt-in stage timers, see enable_profiling
+        self.profiler = None
+
+        # optional CostBudget, and a threading.Event the ui sets to stop a running evaluate
+        self.budget = None
+        self.cancel_event = None
 
     def _tokenize(self, expr_str):
-        # splits the string into numbers, words, and symbols
-        pattern = r"(\d*\.?\d+|[a-z]+|[+\-*/%^()=])"
-        return [t for t in re.findall(pattern, expr_str) if t.strip()]
+        # splits the string into typed numbers, words, and symbols
+        return [self._classify(*groups) for groups in TOKEN_RE.findall(expr_str)]
+
+    def _classify(self, num, callee, word, op, sym):
+        # one regex match -> typed token
+        if num: return Token(NUM, float(num))
+        if callee:
+            if callee in self.ops: return Token(FUNC, callee)
+            if callee in self.constants: return Token(NUM, self.constants[callee])
+            # user functions are looked up when called, like variables
+            return Token(UFUNC, callee)
+        if word:
+            if word in self.constants: return Token(NUM, self.constants[word])
+            if word in self.ops: return Token(FUNC, word)
+            return Token(NAME, word)
+        if op: return Token(OP, op)
+        if sym == '(': return Token(LPAREN, sym)
+        if sym == ')': return Token(RPAREN, sym)
+        if sym == ',': return Token(COMMA, sym)
+        return Token(ASSIGN, sym)
+
+    def _shunt(self, token, output, stack):
+        # one shunting yard step, split out so the live preview can resume mid-expression
+        kind = token.kind
+
+        # names are resolved at run time so cached plans never go stale
+        if kind == NUM or kind == NAME:
+            output.append(token)
+
+        elif kind == FUNC or kind == UFUNC:
+            stack.append(token)
+
+        # parens remember their comma count and where their output started
+        elif kind == LPAREN:
+            stack.append(Token(LPAREN, (0, len(output))))
+        
+        elif kind == OP:
+            prec = self.precedence
+            p = prec[token.value]
+            while stack and stack[-1].kind == OP and prec[stack[-1].value] >= p:
+                output.append(stack.pop())
+            stack.append(token)
+        
+        elif kind == RPAREN:
+            while stack and stack[-1].kind != LPAREN:
+                output.append(stack.pop())
+            if not stack: raise CalculatorError("Mismatched parentheses")
+            commas, start = stack.pop().value
+            if stack and stack[-1].kind == FUNC:
+                if commas: raise CalculatorError(f"{stack[-1].value} takes 1 argument")
+                output.append(stack.pop())
+            elif stack and stack[-1].kind == UFUNC:
+                nargs = 0 if not commas and len(output) == start else commas + 1
+                output.append(Token(UFUNC, (stack.pop().value, nargs)))
+            elif commas: raise CalculatorError("Unexpected comma")
+
+        elif kind == COMMA:
+            while stack and stack[-1].kind != LPAREN:
+                output.append(stack.pop())
+            if not stack: raise CalculatorError("Unexpected comma")
+            commas, start = stack[-1].value
+            stack[-1] = Token(LPAREN, (commas + 1, start))
+        
+        # catch typos
+        else:
+            raise CalculatorError(f"Unknown token: {token.value}")
 
     def _to_rpn(self, tokens):
         output = []
         stack = []
-        
-        for token in tokens:
-            if token.replace('.', '', 1).isdigit():
-                output.append(token)
-            
-            # sub in variable values
-            elif token in self.variables:
-                output.append(str(self.variables[token]))
-
-            elif token in self.ops:
-                stack.append(token)
-            
-            # shunting yard logic
-            elif token in self.precedence:
-                while (stack and stack[-1] in self.precedence and
-                       self.precedence[stack[-1]] >= self.precedence[token]):
-                    output.append(stack.pop())
-                stack.append(token)
-            
-            elif token == '(':
-                stack.append(token)
-            
-            elif token == ')':
-                while stack and stack[-1] != '(':
-                    output.append(stack.pop())
-                if not stack: raise CalculatorError("Mismatched parentheses")
-                stack.pop() 
-                if stack and stack[-1] in self.ops:
-                    output.append(stack.pop())
-            
-            # catch typos
-            else:
-                raise CalculatorError(f"Unknown token: {token}")
+        for token in tokens: self._shunt(token, output, stack)
 
         while stack:
-            if stack[-1] == '(': raise CalculatorError("Mismatched parentheses")
+            if stack[-1].kind == LPAREN: raise CalculatorError("Mismatched parentheses")
             output.append(stack.pop())
             
         return output
 
-    def _eval_rpn(self, rpn_queue):
+    def _build_ir(self, rpn, params=()):
+        # rpn -> expression tree, same arity checks the evaluator used to do
+        # nodes are folded as they're built, children first, so no recursion
+        # params are a function's argument names, they become Arg slots
         stack = []
-        for token in rpn_queue:
-            try:
-                stack.append(float(token))
-                continue
-            except ValueError:
-                pass
-
-            if token in self.precedence:
+        fold = self._fold
+        for token in rpn:
+            kind = token.kind
+            if kind == NUM: stack.append(Num(token.value))
+            elif kind == NAME:
+                stack.append(Arg(params.index(token.value)) if token.value in params else Var(token.value))
+            elif kind == OP:
                 if len(stack) < 2: raise CalculatorError("Missing operand")
                 b, a = stack.pop(), stack.pop()
-                
-                if token == '+': res = a + b
-                elif token == '-': res = a - b
-                elif token == '*': res = a * b
-                elif token == '/': 
-                    if b == 0: raise ZeroDivisionError("Division by zero")
-                    res = a / b
-                elif token == '%': res = a % b
-                elif token == '^': res = math.pow(a, b)
-                stack.append(res)
+                stack.append(fold(BinOp(token.value, a, b)))
+            elif kind == UFUNC:
+                name, nargs = token.value
+                if len(stack) < nargs: raise CalculatorError("Missing argument")
+                args = tuple(stack[len(stack) - nargs:])
+                del stack[len(stack) - nargs:]
+                stack.append(UserCall(name, args))
+            else:
+                if not stack: raise CalculatorError("Missing argument")
+                stack.append(fold(Call(token.value, stack.pop())))
+
+        if len(stack) != 1: raise CalculatorError("Invalid syntax")
+        return stack[0]
+
+    def _fold(self, node):
+        # evaluate a node once if its (already folded) children are constants
+        # anything touching a variable stays symbolic
+        if isinstance(node, BinOp):
+            if isinstance(node.left, Num) and isinstance(node.right, Num):
+                try: return Num(self.binary[node.op](node.left.value, node.right.value))
+                # keep it symbolic so the error surfaces at run time, in order
+                except (ArithmeticError, ValueError): pass
+
+        elif isinstance(node, Call):
+            if isinstance(node.arg, Num):
+                try: res = self.ops[node.func](node.arg.value)
+                except (ArithmeticError, ValueError): return node
+                return Num(0.0 if abs(res) < 1e-15 else res)
+
+        return node
+
+    def _emit(self, node, program):
+        # flatten the tree back into a postfix program
+        # explicit stack so long chains don't hit the recursion limit
+        todo = [node]
+        while todo:
+            n = todo.pop()
+            # finished instructions are plain tuples, nodes are namedtuples
+            if n.__class__ is tuple: program.append(n)
+            elif isinstance(n, Num): program.append((PUSH, n.value))
+            elif isinstance(n, Var): program.append((LOAD, n.name))
+            elif isinstance(n, Arg): program.append((ARG, n.index))
+            elif isinstance(n, BinOp): todo += [(BINARY, n.op), n.right, n.left]
+            elif isinstance(n, UserCall): todo += [(UCALL, (n.name, len(n.args))), *reversed(n.args)]
+            else: todo += [(CALL, n.func), n.arg]
+        return program
+
+    def compile(self, expr_str):
+        # tokenize, parse and fold once per distinct expression
+        # trig folds differently per angle mode so that's part of the key
+        key = (expr_str, self.use_degrees)
+        plan = self.cache.get(key)
+        if plan is None:
+            run = self.profiler.time if self.profiler else _call
+            tokens = run('tokenize', self._tokenize, expr_str)
+            self._check_cancel()
+            if self.budget is not None: self.budget.check_tokens(tokens)
+            rpn = run('parse', self._to_rpn, tokens)
+            plan = run('optimize', lambda r: tuple(self._emit(self._build_ir(r), [])), rpn)
+            self.cache.put(key, plan)
+        return plan
+
+    def _check_cancel(self):
+        if self.cancel_event is not None and self.cancel_event.is_set(): raise CalculatorError("Cancelled")
+
+    def _checked(self, program):
+        # yields the program, polling for cancellation as it goes
+        cancel = self.cancel_event
+        for i, step in enumerate(program):
+            if not i & 1023 and cancel.is_set(): raise CalculatorError("Cancelled")
+            yield step
+
+    def _eval_rpn(self, program, args=(), depth=0):
+        stack = []
+        push, pop = stack.append, stack.pop
+        variables, binary, ops = self.variables, self.binary, self.ops
+
+        if self.budget is not None:
+            # function bodies count against the caller's budget
+            self._ops = len(program) if depth == 0 else self._ops + len(program)
+            self.budget.check_ops(self._ops)
+        steps = program if self.cancel_event is None else self._checked(program)
+
+        for code, arg in steps:
+            if code == PUSH:
+                push(arg)
+
+            elif code == LOAD:
+                if arg not in variables: raise CalculatorError(f"Unknown token: {arg}")
+                push(float(variables[arg]))
+
+            elif code == BINARY:
+                b = pop()
+                stack[-1] = binary[arg](stack[-1], b)
             
             # trig and logs
-            elif token in self.ops:
-                if not stack: raise CalculatorError("Missing argument")
-                res = self.ops[token](stack.pop())
-                
+            elif code == CALL:
+                res = ops[arg](stack[-1])
                 # float precision fix (e.g. sin(180))
-                if abs(res) < 1e-15: res = 0.0
-                stack.append(res)
-        
-        if len(stack) != 1: raise CalculatorError("Invalid syntax")
+                stack[-1] = 0.0 if abs(res) < 1e-15 else res
+
+            elif code == ARG:
+                push(args[arg])
+
+            else:
+                name, nargs = arg
+                call_args = tuple(stack[len(stack) - nargs:])
+                del stack[len(stack) - nargs:]
+                push(self._call_function(name, call_args, depth + 1))
+
         return stack[0]
 
+    def _resolve_function(self, name, nargs, depth):
+        # (function, program) for a call, compiling for the current angle mode if needed
+        fn = self.functions.get(name)
+        if fn is None: raise CalculatorError(f"Unknown function: {name}")
+        if nargs != len(fn.params): raise CalculatorError(f"{name} takes {len(fn.params)} argument(s)")
+        if depth > self.MAX_CALL_DEPTH: raise CalculatorError("Recursion too deep")
+        return fn, fn.programs.get(self.use_degrees) or self._compile_function(fn)
+
+    def _call_function(self, name, args, depth):
+        fn, program = self._resolve_function(name, len(args), depth)
+        # only pure functions are memoized, anything reading variables could go stale
+        if fn.memo is None or not fn.pure: return self._eval_rpn(program, args, depth)
+        key = (args, self.use_degrees)
+        res = fn.memo.get(key)
+        if res is None:
+            res = self._eval_rpn(program, args, depth)
+            fn.memo.put(key, res)
+        return res
+
+    def _compile_function(self, fn):
+        # parsed once per angle mode, same pipeline as compile() with params as Arg slots
+        tokens = self._tokenize(fn.body)
+        if self.budget is not None: self.budget.check_tokens(tokens)
+        program = tuple(self._emit(self._build_ir(self._to_rpn(tokens), fn.params), []))
+        fn.pure = not any(code == LOAD or code == UCALL for code, _ in program)
+        fn.programs[self.use_degrees] = program
+        return program
+
+    def _array_ops(self, np):
+        # numpy counterparts of self.ops, same deg/rad switch
+        if self._np_ops is None:
+            self._np_ops = {
+                'sin': lambda x: np.sin(np.radians(x)) if self.use_degrees else np.sin(x),
+                'cos': lambda x: np.cos(np.radians(x)) if self.use_degrees else np.cos(x),
+                'tan': lambda x: np.tan(np.radians(x)) if self.use_degrees else np.tan(x),
+                'log': np.log10,
+                'ln': np.log,
+                'sqrt': np.sqrt
+            }
+        return self._np_ops
+
+    def _eval_rpn_array(self, program, env, np, errors, args=(), depth=0):
+        stack = []
+        bad = False
+        array_ops = self._array_ops(np)
+
+        # lanes where math/float would have raised
+        def flag(mask, exc):
+            nonlocal bad
+            if not np.any(mask): return
+            if errors == 'raise': raise exc
+            bad = bad | mask
+
+        for code, arg in program:
+            if code == PUSH:
+                stack.append(arg)
+
+            elif code == LOAD:
+                if arg not in env: raise CalculatorError(f"Unknown token: {arg}")
+                stack.append(env[arg])
+
+            elif code == ARG:
+                stack.append(args[arg])
+
+            elif code == UCALL:
+                name, nargs = arg
+                call_args = tuple(stack[len(stack) - nargs:])
+                del stack[len(stack) - nargs:]
+                fn, body = self._resolve_function(name, nargs, depth + 1)
+                res, sub_bad = self._eval_rpn_array(body, env, np, errors, call_args, depth + 1)
+                if sub_bad is not False: bad = bad | sub_bad
+                stack.append(res)
+
+            elif code == BINARY:
+                b, a = stack.pop(), stack.pop()
+
+                if arg == '+': res = np.add(a, b)
+                elif arg == '-': res = np.subtract(a, b)
+                elif arg == '*': res = np.multiply(a, b)
+                elif arg == '/':
+                    flag(np.equal(b, 0), ZeroDivisionError("Division by zero"))
+                    res = np.divide(a, b)
+                elif arg == '%':
+                    flag(np.equal(b, 0), ZeroDivisionError("float modulo"))
+                    res = np.mod(a, b)
+                elif arg == '^':
+                    res = np.power(a, b)
+                    # math.pow raises where numpy returns nan/inf
+                    domain = (np.isnan(res) & ~np.isnan(a) & ~np.isnan(b)) | (np.equal(a, 0) & np.less(b, 0))
+                    flag(domain, ValueError("math domain error"))
+                    flag(np.isinf(res) & np.isfinite(a) & np.isfinite(b) & ~domain, OverflowError("math range error"))
+                stack.append(res)
+
+            else:
+                x = stack.pop()
+                res = array_ops[arg](x)
+                domain = np.isnan(res) & ~np.isnan(x)
+                if arg in ('log', 'ln'): domain = domain | np.equal(x, 0)
+                flag(domain, ValueError("math domain error"))
+
+                # same precision fix as the scalar engine
+                res = np.where(np.abs(res) < 1e-15, 0.0, res)
+                stack.append(res)
+
+        return stack[0], bad
+
+    def evaluate_many(self, expr, errors='raise', **arrays):
+        # one expression over whole arrays, e.g. evaluate_many("x^2", x=xs)
+        # leaves expression/history/ans alone, errors='nan' masks bad lanes instead of raising
+        import numpy as np
+
+        if errors not in ('raise', 'nan'): raise ValueError("errors must be 'raise' or 'nan'")
+        env = dict(self.variables)
+        for name, values in arrays.items(): env[name] = np.asarray(values, dtype=float)
+        shape = np.broadcast_shapes(*(np.shape(v) for v in arrays.values()))
+
+        with np.errstate(all='ignore'):
+            res, bad = self._eval_rpn_array(self.compile(expr), env, np, errors)
+            out = np.array(np.broadcast_to(np.asarray(res, dtype=float), shape))
+            if bad is not False: out[np.broadcast_to(bad, shape)] = np.nan
+        return out
+
+    def _names(self, program):
+        # variables and user functions a program reads
+        return {arg if code == LOAD else arg[0] for code, arg in program if code == LOAD or code == UCALL}
+
+    def _propagate(self, roots, include_roots=False):
+        # recompute only what reads the changed names, upstream first
+        for name in self.graph.downstream(roots):
+            if name in roots and not include_roots: continue
+            expr = self.definitions.get(name)
+            if expr is None: continue
+            try: self.variables[name] = self._eval_rpn(self.compile(expr))
+            # broken upstream, dependents fail with unknown token until it's fixed
+            except Exception: self.variables.pop(name, None)
+
+    def define_function(self, name, params, body, memo_size=None):
+        # f(x, y) = body, results are memoized if the body turns out to be pure, memo_size=0 turns that off
+        if name in self.ops or name in self.constants: raise CalculatorError(f"Cannot redefine {name}")
+        # a parameter named pi or sin would be folded or called instead of bound
+        if not name.isalpha() or not all(p.isalpha() and p not in self.ops and p not in self.constants for p in params):
+            raise CalculatorError("Bad function name")
+        if len(set(params)) != len(params): raise CalculatorError("Duplicate parameter")
+
+        fn = UserFunction(name, params, body, self.FUNCTION_MEMO if memo_size is None else memo_size)
+        # compile now so syntax errors show up at definition, calls resolve later
+        self._compile_function(fn)
+        self.functions[name] = fn
+        # variables the body reads feed reactive definitions that call it
+        self.graph.set(name, self._names(fn.programs[self.use_degrees]))
+        if self.graph.has_dependents(name): self._propagate([name])
+        return fn
+
+    def export_library(self, path):
+        # functions and stored variables as json, ans isn't worth keeping
+        lib = {
+            'functions': {n: {'params': list(f.params), 'body': f.body, 'memo_size': f.memo.maxsize if f.memo else 0}
+                          for n, f in self.functions.items()},
+            'variables': {k: v for k, v in self.variables.items() if k != 'ans'},
+        }
+        with open(path, 'w', encoding='utf-8') as f: json.dump(lib, f, indent=2)
+
+    def import_library(self, path):
+        with open(path, encoding='utf-8') as f: lib = json.load(f)
+        for name, spec in lib.get('functions', {}).items():
+            self.define_function(name, spec['params'], spec['body'], spec.get('memo_size', 0))
+        for name, val in lib.get('variables', {}).items():
+            if name.isalpha() and name not in self.constants: self.variables[name] = float(val)
+        if self.definitions: self._propagate(list(self.definitions), include_roots=True)
+
+    def _format_assigned(self, val):
+        return f"{val:.4g}" if abs(val) > 1e12 or (abs(val) < 1e-6 and val != 0) else str(val)
+
+    def _format_total(self, total):
+        if total == int(total): return str(int(total))
+        return f"{total:.4g}" if abs(total) > 1e12 or (abs(total) < 1e-6 and total != 0) else str(round(total, 8))
+
+    def enable_profiling(self, slowest=10, hook=None):
+        # hook gets one dict per evaluation: expression, seconds, stages, error
+        self.profiler = Profiler(slowest, hook)
+        return self.profiler
+
+    def disable_profiling(self): self.profiler = None
+
+    def stats(self):
+        if self.profiler is None: return {}
+        return dict(self.profiler.stats(), cache=self.cache.info())
+
     def evaluate(self):
+        prof = self.profiler
+        if prof is None: return self._evaluate()
+
+        expr, t0 = self.expression, perf_counter()
+        result, error = self._evaluate()
+        if result is not None or error is not None: prof.record(expr, perf_counter() - t0, error)
+        return (result, error)
+
+    def _evaluate(self):
         self.cycle_index = -1
         if self.has_result or not self.expression: return (None, None)
         
+        prof = self.profiler
         self.history = self.expression
         try:
             # handling variable assignment
             if '=' in self.expression:
                 var, expr = [x.strip() for x in self.expression.split('=', 1)]
+
+                # f(x, y) = body defines a function instead
+                m = FUNC_DEF_RE.fullmatch(var)
+                if m:
+                    params = [p.strip() for p in m.group(2).split(',')] if m.group(2) else []
+                    fn = self.define_function(m.group(1), params, expr)
+                    res_str = f"{fn.name}({', '.join(fn.params)})"
+                    self.expression = res_str
+                    self.has_result = True
+                    self.history_log.append(res_str, expr, self.use_degrees)
+                    return (res_str, None)
+
                 if not var.isalpha(): raise CalculatorError("Bad variable name")
+                if var in self.constants: raise CalculatorError("Cannot assign to constant")
                 
-                val = self._eval_rpn(self._to_rpn(self._tokenize(expr)))
+                program = self.compile(expr)
+                if self.reactive:
+                    cycle = self.graph.find_cycle(var, self._names(program))
+                    if cycle: raise CalculatorError(f"Circular reference: {' -> '.join(cycle)}")
+                    self.graph.set(var, self._names(program))
+                    self.definitions[var] = expr
+                elif var in self.definitions:
+                    # plain STO freezes it again
+                    self.graph.remove(var); del self.definitions[var]
+
+                val = self._eval_rpn(program) if prof is None else prof.time('eval', self._eval_rpn, program)
                 self.variables[var] = val
+                self._propagate([var])
                 
-                res_str = f"{val:.4g}" if abs(val) > 1e12 or (abs(val) < 1e-6 and val != 0) else str(val)
+                res_str = self._format_assigned(val) if prof is None else prof.time('format', self._format_assigned, val)
                 self.expression = res_str
                 self.has_result = True
                 
                 # log assignment to history
-                self.history_log.append(f"{var} = {res_str}")
-                if len(self.history_log) > self.MAX_HISTORY: self.history_log.pop(0)
+                self.history_log.append(var, res_str, self.use_degrees)
                 
                 return (res_str, None)
 
             # standard eval
-            total = self._eval_rpn(self._to_rpn(self._tokenize(self.expression)))
+            program = self.compile(self.expression)
+            total = self._eval_rpn(program) if prof is None else prof.time('eval', self._eval_rpn, program)
             self.variables['ans'] = total
+            if self.graph.has_dependents('ans'): self._propagate(['ans'])
 
-            if total == int(total): total_str = str(int(total))
-            else: total_str = f"{total:.4g}" if abs(total) > 1e12 or (abs(total) < 1e-6 and total != 0) else str(round(total, 8))
+            total_str = self._format_total(total) if prof is None else prof.time('format', self._format_total, total)
             
-            self.history_log.append(f"{self.history} = {total_str}")
-            if len(self.history_log) > self.MAX_HISTORY: self.history_log.pop(0)
+            self.history_log.append(self.history, total_str, self.use_degrees)
 
             self.expression = total_str
             self.has_result = True
@@ -157,11 +617,13 @@ class CalculatorModel:
             return (None, str(e))
 
     def get_history(self): return self.history_log
+
+    def cache_info(self): return self.cache.info()
     
     def cycle_up(self):
         if not self.history_log: return None
         self.cycle_index = len(self.history_log) - 1 if self.cycle_index == -1 else max(0, self.cycle_index - 1)
-        self.expression = self.history_log[self.cycle_index].split(' = ')[0]
+        self.expression = self.history_log.record(self.cycle_index).expression
         return self.expression
 
     def cycle_down(self):
@@ -169,7 +631,7 @@ class CalculatorModel:
         self.cycle_index += 1
         if self.cycle_index >= len(self.history_log):
             self.cycle_index = -1; self.expression = ""; return ""
-        self.expression = self.history_log[self.cycle_index].split(' = ')[0]
+        self.expression = self.history_log.record(self.cycle_index).expression
         return self.expression
 
     def append_char(self, char):
@@ -185,8 +647,22 @@ class CalculatorModel:
 
     def clear(self):
         self.expression = ""; self.history = ""; self.has_result = False
-        self.history_log.clear(); self.cycle_index = -1
+        # persisted history survives AC
+        if not self.history_log.persistent: self.history_log.clear()
+        self.cycle_index = -1
+
+    def reset(self):
+        # back to a fresh session, caches, budget and profiler are kept
+        self.clear()
+        self.use_degrees = True
+        self.variables = {'ans': 0.0}
+        self.functions = {}
+        self.reactive = False
+        self.definitions = {}
+        self.graph = DependencyGraph()
     
     def toggle_degrees(self):
         self.use_degrees = not self.use_degrees
+        # trig in stored definitions changes with the mode
+        if self.definitions: self._propagate(list(self.definitions), include_roots=True)
         return self.use_degrees
\ No newline at end of file
@@ -0,0 +1,99 @@
+import numpy as np
+
+# sampling for the plot window, numpy only so it can be used without tk
+
+class AdaptiveSampler:
+    # samples an expression in x over a range, refining only where the curve bends or breaks
+    # every x sits on a power-of-two grid, so pans and zooms hit points already computed
+    def __init__(self, model, base=256, max_rounds=8, bend=0.02, max_cached=200000):
+        self.model = model
+        self.base = base
+        self.max_rounds = max_rounds
+        self.bend = bend
+        self.max_cached = max_cached
+        self.key = None
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+        self.evaluated = 0  # points actually sent to the engine
+
+    def _lookup(self, x):
+        # y for each x, evaluating only the ones not cached yet
+        new = x[~np.isin(x, self.xs)] if self.xs.size else x
+        if new.size:
+            y = self.model.evaluate_many(self.key[0], errors='nan', x=new)
+            self.evaluated += new.size
+            xs, ys = np.concatenate([self.xs, new]), np.concatenate([self.ys, y])
+            order = np.argsort(xs, kind='stable')
+            self.xs, self.ys = xs[order], ys[order]
+        return self.ys[np.searchsorted(self.xs, x)]
+
+    def _inputs(self, expr):
+        # everything besides x the curve reads: variable values, and the functions it calls by identity
+        # followed into function bodies, so redefining f or assigning a global it reads both start over
+        m = self.model
+        todo, seen, inputs = list(m._names(m.compile(expr))), {'x'}, set()
+        while todo:
+            name = todo.pop()
+            if name in seen: continue
+            seen.add(name)
+            fn = m.functions.get(name)
+            if fn is None:
+                inputs.add((name, m.variables.get(name)))
+                continue
+            inputs.add((name, fn))
+            todo.extend(m._names(fn.programs.get(m.use_degrees) or m._compile_function(fn)))
+        return frozenset(inputs)
+
+    def sample(self, expr, x0, x1):
+        # sorted x, y for the visible range
+        key = (expr, self.model.use_degrees, self._inputs(expr))
+        if key != self.key or self.xs.size > self.max_cached:
+            self.key = key
+            self.xs, self.ys = np.empty(0), np.empty(0)
+
+        step = 2.0 ** np.floor(np.log2((x1 - x0) / self.base))
+        x = np.arange(np.floor(x0 / step), np.ceil(x1 / step) + 1) * step
+        y = self._lookup(x)
+
+        for _ in range(self.max_rounds):
+            scale = np.ptp(y_range(y)) or 1.0
+            finite = np.isfinite(y)
+            with np.errstate(invalid='ignore'):
+                jump = np.abs(np.diff(y)) > scale * 0.25
+                bend = np.zeros(len(x), dtype=bool)
+                bend[1:-1] = np.abs(y[:-2] - 2 * y[1:-1] + y[2:]) > scale * self.bend
+
+            # split an interval if either end bends, it jumps, or it crosses a domain edge
+            split = jump | (finite[:-1] != finite[1:]) | bend[:-1] | bend[1:]
+            if not split.any(): break
+            mids = (x[:-1][split] + x[1:][split]) / 2
+            x = np.concatenate([x, mids])
+            order = np.argsort(x, kind='stable')
+            x = x[order]
+            y = np.concatenate([y, self._lookup(mids)])[order]
+        return x, y
+
+def y_range(y):
+    # robust vertical range, asymptotes shouldn't flatten the rest of the curve
+    finite = y[np.isfinite(y)]
+    if finite.size < 2: return (-1.0, 1.0)
+    lo, hi = np.percentile(finite, [2, 98])
+    if hi - lo < 1e-12: lo, hi = lo - 1, hi + 1
+    pad = (hi - lo) * 0.05
+    return (lo - pad, hi + pad)
+
+def to_screen(x, y, x0, x1, y0, y1, width, height):
+    # flat canvas coords per unbroken run, cut at gaps and asymptotes
+    px = (x - x0) / (x1 - x0) * width
+    with np.errstate(invalid='ignore', over='ignore'):
+        py = height - (y - y0) / (y1 - y0) * height
+        ok = np.isfinite(py)
+        py = np.clip(py, -height, 2 * height)
+        breaks = ~ok
+        breaks[1:] |= np.abs(np.diff(py)) >= height
+
+    runs = []
+    for idx in np.split(np.arange(len(x)), np.flatnonzero(breaks)):
+        idx = idx[ok[idx]]
+        if idx.size >= 2: runs.append(np.column_stack([px[idx], py[idx]]).ravel().tolist())
+    return runs
@@ -0,0 +1,66 @@
+from bisect import bisect_left
+
+from model import TOKEN_RE, FUNC_DEF_RE, LPAREN, RPAREN, Token
+
+class LivePreview:
+    # result-as-you-type, never touches history, ans or has_result
+    # keeps the token list and shunting yard state after every token so a
+    # keystroke only re-parses from the first changed character onwards
+    def __init__(self, model):
+        self.model = model
+        self.text = ""
+        self.ends = []      # end offset of each token
+        self.states = []    # (len(output), stack) after each token
+        self.output = []
+
+    def _reparse(self, text):
+        # first changed char
+        p = 0
+        n = min(len(text), len(self.text))
+        while p < n and text[p] == self.text[p]: p += 1
+
+        # a match can depend on the char after its end too ("1." stops at the dot only
+        # because no digit follows it), so only tokens ending before p - 1 are safe
+        keep = bisect_left(self.ends, p - 1)
+        del self.ends[keep:]; del self.states[keep:]
+        if keep:
+            out_len, stack = self.states[-1]
+            pos = self.ends[-1]
+        else:
+            out_len, stack, pos = 0, (), 0
+        del self.output[out_len:]
+        stack = list(stack)
+        self.text = text
+
+        model = self.model
+        for m in TOKEN_RE.finditer(text, pos):
+            # a bad token stops here, the next keystroke resumes from the last good one
+            model._shunt(model._classify(*m.groups()), self.output, stack)
+            self.ends.append(m.end())
+            self.states.append((len(self.output), tuple(stack)))
+
+        # open brackets are closed implicitly while typing, on copies so the saved state stays put
+        output = list(self.output)
+        close = Token(RPAREN, ')')
+        while any(t.kind == LPAREN for t in stack): model._shunt(close, output, stack)
+        return output + stack[::-1]
+
+    def evaluate(self, text):
+        # (result, error) for the text as typed so far, (None, None) if there's nothing to show
+        model = self.model
+        assigned = '=' in text
+        if assigned:
+            lhs, text = text.split('=', 1)
+            # a function definition has nothing to show until it's called
+            if FUNC_DEF_RE.fullmatch(lhs.strip()): text = ""
+        if not text.strip():
+            self._reparse("")
+            return (None, None)
+
+        try:
+            rpn = self._reparse(text)
+            if model.budget is not None: model.budget.check_ops(len(rpn))
+            val = model._eval_rpn(model._emit(model._build_ir(rpn), []))
+            return (model._format_assigned(val) if assigned else model._format_total(val), None)
+        except Exception as e:
+            return (None, str(e))
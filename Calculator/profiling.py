@@ -0,0 +1,46 @@
+import heapq
+from collections import Counter, defaultdict
+from time import perf_counter
+
+class Profiler:
+    # per-stage timers for CalculatorModel, only exists while profiling is on
+    def __init__(self, slowest=10, hook=None):
+        self.hook = hook
+        self.n_slowest = slowest
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.errors = Counter()
+        self.evaluations = 0
+        self._slowest = []  # min-heap of (seconds, seq, expression)
+        self._current = {}
+
+    def time(self, stage, fn, *args):
+        t0 = perf_counter()
+        try: return fn(*args)
+        finally:
+            dt = perf_counter() - t0
+            self.calls[stage] += 1
+            self.seconds[stage] += dt
+            self._current[stage] = self._current.get(stage, 0.0) + dt
+
+    def record(self, expression, seconds, error):
+        # called once per evaluate()
+        self.evaluations += 1
+        # "Unknown token: x" and "Unknown token: y" are the same kind of error
+        if error: self.errors[error.split(':', 1)[0]] += 1
+
+        item = (seconds, self.evaluations, expression)
+        if len(self._slowest) < self.n_slowest: heapq.heappush(self._slowest, item)
+        elif seconds > self._slowest[0][0]: heapq.heapreplace(self._slowest, item)
+
+        stages, self._current = self._current, {}
+        if self.hook: self.hook({'expression': expression, 'seconds': seconds, 'stages': stages, 'error': error})
+
+    def stats(self):
+        return {
+            'evaluations': self.evaluations,
+            'stages': {s: {'calls': self.calls[s], 'total_s': self.seconds[s],
+                           'mean_us': self.seconds[s] / self.calls[s] * 1e6} for s in self.calls},
+            'errors': dict(self.errors),
+            'slowest': [(expr, secs) for secs, _, expr in sorted(self._slowest, reverse=True)],
+        }
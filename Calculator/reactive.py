@@ -0,0 +1,51 @@
+class DependencyGraph:
+    # which stored variables read which names, for reactive STO
+    def __init__(self):
+        self.deps = {}        # var -> names its definition reads
+        self.dependents = {}  # name -> vars whose definition reads it
+
+    def find_cycle(self, var, names):
+        # path back to var if defining var from names would close a loop
+        stack = [(n, [var, n]) for n in names]
+        seen = set()
+        while stack:
+            name, path = stack.pop()
+            if name == var: return path
+            if name in seen: continue
+            seen.add(name)
+            stack.extend((n, path + [n]) for n in self.deps.get(name, ()))
+        return None
+
+    def set(self, var, names):
+        self.remove(var)
+        self.deps[var] = set(names)
+        for n in names: self.dependents.setdefault(n, set()).add(var)
+
+    def remove(self, var):
+        for n in self.deps.pop(var, ()):
+            users = self.dependents.get(n)
+            if users:
+                users.discard(var)
+                if not users: del self.dependents[n]
+
+    def has_dependents(self, name): return name in self.dependents
+
+    def downstream(self, roots):
+        # roots plus everything fed by them, upstream first (reverse dfs post-order)
+        seen, order = set(), []
+        for root in roots:
+            if root in seen: continue
+            seen.add(root)
+            stack = [(root, iter(self.dependents.get(root, ())))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if child not in seen:
+                        seen.add(child)
+                        stack.append((child, iter(self.dependents.get(child, ()))))
+                        break
+                else:
+                    stack.pop()
+                    order.append(node)
+        order.reverse()
+        return order
@@ -0,0 +1,290 @@
+import argparse
+import asyncio
+import json
+import secrets
+import statistics
+import time
+from collections import OrderedDict
+
+from model import CalculatorModel, CostBudget, LRUCache
+
+# local json-rpc 2.0 service for the engine, no tk import anywhere on this path
+# one json request (or batch array) per line over tcp, one response line back
+# usage: python server.py --port 8765
+#        python server.py --bench 50
+
+BUDGET = {'max_tokens': 10000, 'max_depth': 200, 'max_ops': 10000}
+MAX_BATCH = 1000
+MAX_LINE = 1 << 20
+
+# json-rpc error codes
+PARSE_ERROR, INVALID_REQUEST, METHOD_NOT_FOUND, INVALID_PARAMS, INTERNAL_ERROR = -32700, -32600, -32601, -32602, -32603
+CALC_ERROR, UNKNOWN_SESSION = -32000, -32001
+
+class RPCError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+class SessionPool:
+    # one isolated model per session, idle ones are evicted and their models reused
+    def __init__(self, max_sessions=1000, idle_timeout=300.0, spare=64):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_spare = spare
+        self.sessions = OrderedDict()  # id -> [model, last used], least recent first
+        self.spare = []
+        # plans don't depend on session state, so every session shares one cache
+        self.cache = LRUCache(4096)
+
+    def _new_model(self):
+        model = CalculatorModel()
+        model.budget = CostBudget(**BUDGET)
+        model.cache = self.cache
+        return model
+
+    def open(self):
+        sid = secrets.token_hex(8)
+        model = self.spare.pop() if self.spare else self._new_model()
+        self.sessions[sid] = [model, time.monotonic()]
+        # over the cap the least recently used session goes
+        while len(self.sessions) > self.max_sessions: self._recycle(self.sessions.popitem(last=False)[1][0])
+        return sid
+
+    def get(self, sid):
+        entry = self.sessions.get(sid)
+        if entry is None: raise RPCError(UNKNOWN_SESSION, f"Unknown session: {sid}")
+        entry[1] = time.monotonic()
+        self.sessions.move_to_end(sid)
+        return entry[0]
+
+    def close(self, sid):
+        entry = self.sessions.pop(sid, None)
+        if entry: self._recycle(entry[0])
+
+    def evict_idle(self):
+        # sessions are kept in use order so the idle ones are all at the front
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = 0
+        while self.sessions:
+            sid, (model, last) = next(iter(self.sessions.items()))
+            if last > cutoff: break
+            del self.sessions[sid]
+            self._recycle(model)
+            evicted += 1
+        return evicted
+
+    def _recycle(self, model):
+        if len(self.spare) < self.max_spare:
+            model.reset()
+            self.spare.append(model)
+
+class CalculatorService:
+    # json-rpc methods over a SessionPool
+    # requests without a "session" param use one session tied to their connection
+    def __init__(self, pool=None):
+        self.pool = pool or SessionPool()
+        self.methods = {
+            'session.open': self.session_open,
+            'session.close': self.session_close,
+            'evaluate': self.evaluate,
+            'assign': self.assign,
+            'history': self.history,
+            'variables': self.variables,
+            'set_mode': self.set_mode,
+        }
+
+    # --- methods ---
+
+    def session_open(self, conn): return {'session': self.pool.open()}
+
+    def session_close(self, conn, session=None):
+        self.pool.close(session or conn.pop('session', None))
+        return True
+
+    def _run(self, model, expr):
+        model.expression = expr
+        model.has_result = False
+        result, error = model.evaluate()
+        if error: raise RPCError(CALC_ERROR, error)
+        return result
+
+    def evaluate(self, conn, expr, session=None):
+        return {'result': self._run(self._model(conn, session), str(expr).rstrip('='))}
+
+    def assign(self, conn, name, expr, session=None):
+        return {'result': self._run(self._model(conn, session), f"{name}={expr}")}
+
+    def history(self, conn, limit=10, session=None):
+        try: limit = int(limit)
+        except (TypeError, ValueError): raise RPCError(INVALID_PARAMS, "limit must be an integer") from None
+        if limit < 0: raise RPCError(INVALID_PARAMS, "limit can't be negative")
+        log = self._model(conn, session).history_log
+        n = len(log)
+        return [{'expression': e.expression, 'result': e.result}
+                for e in (log.record(i) for i in range(max(0, n - limit), n))]
+
+    def variables(self, conn, session=None):
+        return dict(self._model(conn, session).variables)
+
+    def set_mode(self, conn, degrees, session=None):
+        model = self._model(conn, session)
+        if model.use_degrees != bool(degrees): model.toggle_degrees()
+        return {'degrees': model.use_degrees}
+
+    def _model(self, conn, session):
+        if session is not None: return self.pool.get(session)
+        # connection session, opened on first use and closed with the connection
+        if 'session' not in conn or conn['session'] not in self.pool.sessions: conn['session'] = self.pool.open()
+        return self.pool.get(conn['session'])
+
+    # --- protocol ---
+
+    def dispatch(self, msg, conn):
+        # response dict, or None for a notification
+        rid = msg.get('id') if isinstance(msg, dict) else None
+        try:
+            if not isinstance(msg, dict) or msg.get('jsonrpc') != '2.0' or not isinstance(msg.get('method'), str):
+                raise RPCError(INVALID_REQUEST, "Invalid request")
+            fn = self.methods.get(msg['method'])
+            if fn is None: raise RPCError(METHOD_NOT_FOUND, f"Method not found: {msg['method']}")
+
+            params = msg.get('params', {})
+            try:
+                if isinstance(params, dict): result = fn(conn, **params)
+                elif isinstance(params, list): result = fn(conn, *params)
+                else: raise TypeError
+            except TypeError: raise RPCError(INVALID_PARAMS, "Invalid params")
+        except RPCError as e:
+            resp = {'jsonrpc': '2.0', 'error': {'code': e.code, 'message': str(e)}, 'id': rid}
+        except Exception as e:
+            # a bug in one method shouldn't take the connection (and its session) down with it
+            resp = {'jsonrpc': '2.0', 'error': {'code': INTERNAL_ERROR, 'message': f"Internal error: {e}"}, 'id': rid}
+        else:
+            resp = {'jsonrpc': '2.0', 'result': result, 'id': rid}
+        # notifications get no reply, even on error
+        if isinstance(msg, dict) and 'id' not in msg: return None
+        return resp
+
+    def handle_line(self, line, conn):
+        # one request line -> one response line (or None)
+        try: msg = json.loads(line)
+        except ValueError: return _error_line(PARSE_ERROR, "Parse error")
+
+        if isinstance(msg, list):
+            # a batch is answered in one line, notifications left out
+            if not msg or len(msg) > MAX_BATCH: return _error_line(INVALID_REQUEST, "Invalid batch size")
+            out = [r for r in (self.dispatch(m, conn) for m in msg) if r is not None]
+            return json.dumps(out) if out else None
+
+        resp = self.dispatch(msg, conn)
+        return json.dumps(resp) if resp is not None else None
+
+    async def handle(self, reader, writer):
+        conn = {}
+        try:
+            while True:
+                try: line = await reader.readline()
+                except ValueError:
+                    writer.write((_error_line(INVALID_REQUEST, "Request too long") + "\n").encode())
+                    break
+                if not line: break
+                if not line.strip(): continue
+
+                out = self.handle_line(line, conn)
+                if out is not None:
+                    writer.write((out + "\n").encode())
+                    await writer.drain()
+        except ConnectionError: pass
+        finally:
+            if 'session' in conn: self.pool.close(conn['session'])
+            writer.close()
+
+def _error_line(code, message):
+    return json.dumps({'jsonrpc': '2.0', 'error': {'code': code, 'message': message}, 'id': None})
+
+async def _evict_loop(pool, every):
+    while True:
+        await asyncio.sleep(every)
+        pool.evict_idle()
+
+async def start(host='127.0.0.1', port=8765, pool=None):
+    # (server, service), port=0 picks a free one
+    service = CalculatorService(pool)
+    server = await asyncio.start_server(service.handle, host, port, limit=MAX_LINE)
+    service.evictor = asyncio.ensure_future(_evict_loop(service.pool, max(1.0, service.pool.idle_timeout / 4)))
+    return server, service
+
+# --- load test, localhost only ---
+
+async def _client(host, port, exprs, batch, latencies):
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+    clock = time.perf_counter
+    try:
+        for i in range(0, len(exprs), batch):
+            reqs = [{'jsonrpc': '2.0', 'method': 'evaluate', 'params': {'expr': e}, 'id': n}
+                    for n, e in enumerate(exprs[i:i + batch], i)]
+            payload = json.dumps(reqs if batch > 1 else reqs[0]) + "\n"
+            t0 = clock()
+            writer.write(payload.encode())
+            await writer.drain()
+            await reader.readline()
+            latencies.append(clock() - t0)
+    finally:
+        writer.close()
+
+async def run_bench(clients=50, requests=200, batch=1, seed=0):
+    from bench import make_workloads
+
+    server, service = await start(port=0)
+    host, port = server.sockets[0].getsockname()[:2]
+    work = [e for exprs in make_workloads(requests, seed).values() for e in exprs if '=' not in e]
+
+    latencies = []
+    t0 = time.perf_counter()
+    # each client cycles through its own slice of the workloads
+    slices = [[work[(c + i * clients) % len(work)] for i in range(requests)] for c in range(clients)]
+    await asyncio.gather(*(_client(host, port, exprs, batch, latencies) for exprs in slices))
+    wall = time.perf_counter() - t0
+
+    service.evictor.cancel(); server.close()
+    await server.wait_closed()
+
+    latencies.sort()
+    calls = clients * requests
+    return {
+        'requests_per_sec': calls / wall,
+        'round_trips': len(latencies),
+        'p50_ms': latencies[len(latencies) // 2] * 1e3,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e3,
+        'mean_ms': statistics.fmean(latencies) * 1e3,
+        'cache': service.pool.cache.info(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the calculator engine as local JSON-RPC.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-sessions', type=int, default=1000)
+    parser.add_argument('--idle-timeout', type=float, default=300.0, help="seconds before an idle session is evicted")
+    parser.add_argument('--bench', type=int, metavar='CLIENTS', help="run a localhost load test with this many clients instead")
+    parser.add_argument('--requests', type=int, default=200, help="requests per bench client")
+    parser.add_argument('--batch', type=int, default=1, help="requests per bench round trip")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        res = asyncio.run(run_bench(args.bench, args.requests, args.batch))
+        print(f"{res['requests_per_sec']:.0f} req/s over {res['round_trips']} round trips, "
+              f"p50 {res['p50_ms']:.2f} ms, p99 {res['p99_ms']:.2f} ms, cache {res['cache']}")
+        return
+
+    async def serve():
+        server, _ = await start(args.host, args.port, SessionPool(args.max_sessions, args.idle_timeout))
+        print(f"Listening on {args.host}:{args.port}")
+        async with server: await server.serve_forever()
+
+    try: asyncio.run(serve())
+    except KeyboardInterrupt: pass
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -20,6 +20,10 @@ class CalculatorView:
             'small': ('Arial', 10) 
         }
         
+        # result font per size + measured widths, see _fit_font
+        self._result_fonts = {}
+        self._widths = {}
+
         self.root.configure(bg=self.colors['bg'])
         self._setup_ui()
 
@@ -66,6 +70,18 @@ class CalculatorView:
         self.deg_switch.pack(side="right", padx=2)
         self.deg_switch.bind("<Button-1>", lambda e: self.controller.toggle_degrees())
 
+        # live preview toggle
+        self.live_switch = tk.Label(top_bar, text="LIVE", font=self.fonts['small'],
+                                   bg=self.colors['accent'], fg=self.colors['text'], width=4)
+        self.live_switch.pack(side="right", padx=2)
+        self.live_switch.bind("<Button-1>", lambda e: self.controller.toggle_preview())
+
+        # graph window
+        self.plot_btn = tk.Label(top_bar, text="PLOT", font=self.fonts['small'],
+                                bg=self.colors['btn_bg'], fg=self.colors['text'], width=4)
+        self.plot_btn.pack(side="right", padx=2)
+        self.plot_btn.bind("<Button-1>", lambda e: self.controller.open_plot())
+
         # history stack
         hist_frame = tk.Frame(top_bar, bg=self.colors['bg'])
         hist_frame.pack(side="left", fill="x", expand=True)
@@ -143,30 +159,64 @@ class CalculatorView:
         if ro: w.config(state=tk.NORMAL)
         
         if w == self.res:
-            fc = self.fonts['result']
-            f = font.Font(family=fc[0], size=fc[1], weight=fc[2])
-            while f.measure(txt) > w.winfo_width() - 20 and f['size'] > 10:
-                f.config(size=f['size'] - 2)
-            w.config(font=f)
+            f = self._fit_font(txt, w.winfo_width() - 20)
+            if w['font'] != str(f): w.config(font=f)
             
         w.delete(0, tk.END); w.insert(0, txt)
         if ro: w.config(state='readonly')
 
+    def _measure(self, size, txt):
+        key = (size, txt)
+        w = self._widths.get(key)
+        if w is None:
+            if len(self._widths) > 512: self._widths.clear()
+            w = self._widths[key] = self._result_font(size).measure(txt)
+        return w
+
+    def _result_font(self, size):
+        f = self._result_fonts.get(size)
+        if f is None:
+            fc = self.fonts['result']
+            f = self._result_fonts[size] = font.Font(family=fc[0], size=size, weight=fc[2])
+        return f
+
+    def _fit_font(self, txt, avail):
+        # biggest of 24, 22 .. 10 that fits, binary search instead of stepping down
+        sizes = range(10, self.fonts['result'][1] + 1, 2)
+        lo, hi = 0, len(sizes) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._measure(sizes[mid], txt) <= avail: lo = mid
+            else: hi = mid - 1
+        return self._result_font(sizes[lo])
+
     def open_history_window(self, history_list):
         top = tk.Toplevel(self.root)
         top.title("History")
         top.geometry("300x400")
         top.configure(bg=self.colors['bg'])
-        
-        txt = tk.Text(top, bg=self.colors['bg'], fg=self.colors['text'], font=self.fonts['history'])
-        txt.pack(fill="both", expand=True)
-        for item in history_list: txt.insert(tk.END, item + "\n")
-        txt.config(state='disabled')
+        HistoryViewer(top, history_list, self.colors, self.fonts['history'])
+
+    def open_plot_window(self, sampler, expr, x_range, busy=None):
+        top = tk.Toplevel(self.root)
+        top.title("Plot")
+        # sit next to the calculator
+        self.root.update_idletasks()
+        top.geometry(f"480x420+{self.root.winfo_rootx() + self.root.winfo_width() + 10}+{self.root.winfo_rooty()}")
+        top.configure(bg=self.colors['bg'])
+        PlotWindow(top, sampler, expr, x_range, self.colors, self.fonts, busy)
 
     # getters and setters
     def get_expression(self): return self.expr.get()
     def update_expression(self, txt): self._set_text(self.expr, txt)
-    def update_result(self, txt): self._set_text(self.res, txt)
+    def update_result(self, txt):
+        self.res.config(fg=self.colors['text'])
+        self._set_text(self.res, txt)
+
+    def update_preview(self, txt):
+        # dimmed so it doesn't read as a final answer
+        self.res.config(fg=self.colors['dim'])
+        self._set_text(self.res, txt)
     
     def update_history(self, h):
         for l, t in zip(self.hist_lbls, ([" "]*3 + h)[-3:]): l.config(text=t if t else " ")
@@ -174,6 +224,11 @@ class CalculatorView:
     def update_deg_btn(self, is_deg):
         self.deg_switch.config(text="DEG" if is_deg else "RAD", bg=self.colors['accent'] if is_deg else "#505050")
 
+    def update_preview_btn(self, on):
+        self.live_switch.config(bg=self.colors['accent'] if on else "#505050")
+
+    def schedule(self, ms, f): return self.root.after(ms, f)
+    def cancel(self, job): self.root.after_cancel(job)
     def bind_global_keys(self, k, f): self.root.bind(k, f)
     def unbind_global_keys(self, k): self.root.unbind(k)
     def bind_edit_keys(self, k, f): self.expr.bind(k, f)
@@ -181,4 +236,162 @@ class CalculatorView:
     def get_expression_state(self): return self.expr['state']
     def set_display_state(self, s): self.expr.config(state=s)
     def focus_expression(self): self.expr.focus_set()
-    def focus_root(self): self.root.focus_set()
\ No newline at end of file
+    def focus_root(self): self.root.focus_set()
+
+class HistoryViewer:
+    # only draws the rows on screen, so opening is the same cost for 50 or 500k entries
+    def __init__(self, parent, source, colors, fnt):
+        self.source = source
+        self.ids = None  # search hits, None = everything
+        self.first = None
+        self.rows = []
+        self.colors = colors
+        self.font = font.Font(font=fnt)
+        self.row_h = self.font.metrics('linespace') + 2
+
+        self.search = tk.Entry(parent, font=fnt, bd=0, bg=colors['display_bg'], fg=colors['text'],
+                               insertbackground=colors['text'])
+        self.search.pack(side="top", fill="x", padx=4, pady=4)
+        self.search.bind("<KeyRelease>", lambda e: self._schedule_search())
+        self._search_job = None
+
+        body = tk.Frame(parent, bg=colors['bg'])
+        body.pack(fill="both", expand=True)
+        self.bar = tk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.bar.pack(side="right", fill="y")
+        self.canvas = tk.Canvas(body, bg=colors['bg'], highlightthickness=0)
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self._resize(e.height))
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"): self.canvas.bind(seq, self._on_wheel)
+
+    def _count(self): return len(self.source) if self.ids is None else len(self.ids)
+
+    def _item(self, i): return self.source[i if self.ids is None else self.ids[i]]
+
+    def _resize(self, height):
+        # one text item per visible row, reused while scrolling
+        need = max(1, height // self.row_h + 1)
+        while len(self.rows) < need:
+            y = len(self.rows) * self.row_h + 2
+            self.rows.append(self.canvas.create_text(4, y, anchor="nw", font=self.font, fill=self.colors['text']))
+        while len(self.rows) > need: self.canvas.delete(self.rows.pop())
+        # newest at the bottom, like the old text box
+        self._scroll_to(self._count() if self.first is None else self.first)
+
+    def _visible(self): return max(1, len(self.rows) - 1)
+
+    def _scroll_to(self, first):
+        n = self._count()
+        self.first = max(0, min(first, n - self._visible()))
+        for r, item in enumerate(self.rows):
+            i = self.first + r
+            self.canvas.itemconfig(item, text=self._item(i) if i < n else "")
+        if n: self.bar.set(self.first / n, min(1.0, (self.first + self._visible()) / n))
+        else: self.bar.set(0, 1)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto': self._scroll_to(int(float(amount) * self._count()))
+        else:
+            step = self._visible() if unit == 'pages' else 1
+            self._scroll_to(self.first + int(amount) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4: delta = -3
+        elif event.num == 5: delta = 3
+        else: delta = -3 if event.delta > 0 else 3
+        self._scroll_to(self.first + delta)
+
+    def _schedule_search(self):
+        if self._search_job: self.canvas.after_cancel(self._search_job)
+        self._search_job = self.canvas.after(200, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        q = self.search.get().strip()
+        if not q: self.ids = None
+        elif hasattr(self.source, 'search'): self.ids = self.source.search(q)[::-1]
+        else: self.ids = [i for i, item in enumerate(self.source) if q in item]
+        self._scroll_to(self._count())
+
+
+class PlotWindow:
+    # graph of one expression in x, drag to pan and wheel to zoom
+    def __init__(self, parent, sampler, expr, x_range, colors, fonts, busy=None):
+        from plot import y_range, to_screen
+        self._y_range, self._to_screen = y_range, to_screen
+
+        self.sampler = sampler
+        # the sampler shares the calculator's model, so no sampling while a calculation runs
+        self.busy = busy or (lambda: False)
+        self.colors = colors
+        self.x0, self.x1 = x_range
+        self._drag = None
+        self._redraw_job = None
+
+        self.entry = tk.Entry(parent, font=fonts['expr'], bd=0, bg=colors['display_bg'], fg=colors['text'],
+                              insertbackground=colors['text'])
+        self.entry.insert(0, expr)
+        self.entry.pack(side="top", fill="x", padx=4, pady=4)
+        self.entry.bind("<Return>", lambda e: self.redraw())
+
+        self.status = tk.Label(parent, text=" ", font=fonts['small'], bg=colors['bg'], fg=colors['dim'], anchor="w")
+        self.status.pack(side="bottom", fill="x", padx=4)
+
+        self.canvas = tk.Canvas(parent, bg=colors['bg'], highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self._schedule())
+        self.canvas.bind("<ButtonPress-1>", self._start_drag)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"): self.canvas.bind(seq, self._on_wheel)
+
+    def _schedule(self):
+        # coalesce bursts of motion/resize events into one redraw
+        if self._redraw_job: self.canvas.after_cancel(self._redraw_job)
+        self._redraw_job = self.canvas.after(15, self.redraw)
+
+    def redraw(self):
+        self._redraw_job = None
+        if self.busy():
+            self._redraw_job = self.canvas.after(50, self.redraw)
+            return
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if w < 2 or h < 2: return
+        self.canvas.delete("all")
+        try:
+            x, y = self.sampler.sample(self.entry.get().strip(), self.x0, self.x1)
+        except Exception as e:
+            self.status.config(text=f"Error: {e}")
+            return
+
+        y0, y1 = self._y_range(y)
+        self._draw_axes(w, h, y0, y1)
+        for coords in self._to_screen(x, y, self.x0, self.x1, y0, y1, w, h):
+            self.canvas.create_line(*coords, fill=self.colors['accent'], width=2)
+        self.status.config(text=f"x: {self.x0:.4g} .. {self.x1:.4g}   y: {y0:.4g} .. {y1:.4g}   {len(x)} points")
+
+    def _draw_axes(self, w, h, y0, y1):
+        if self.x0 < 0 < self.x1:
+            px = -self.x0 / (self.x1 - self.x0) * w
+            self.canvas.create_line(px, 0, px, h, fill=self.colors['btn_bg'])
+        if y0 < 0 < y1:
+            py = h - (-y0) / (y1 - y0) * h
+            self.canvas.create_line(0, py, w, py, fill=self.colors['btn_bg'])
+
+    def _start_drag(self, event): self._drag = event.x
+
+    def _on_drag(self, event):
+        if self._drag is None: return
+        dx = (event.x - self._drag) / max(1, self.canvas.winfo_width()) * (self.x1 - self.x0)
+        self.x0 -= dx; self.x1 -= dx
+        self._drag = event.x
+        self._schedule()
+
+    def _on_wheel(self, event):
+        # zoom around the cursor
+        zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+        f = 0.8 if zoom_in else 1.25
+        cx = self.x0 + event.x / max(1, self.canvas.winfo_width()) * (self.x1 - self.x0)
+        self.x0 = cx - (cx - self.x0) * f
+        self.x1 = cx + (self.x1 - cx) * f
+        self._schedule()
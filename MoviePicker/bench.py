@@ -0,0 +1,121 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from moviepicker.tmdb_standin import add_standin_args, standin_from_args
+
+# end-to-end benchmark of movie.py against the local TMDb stand-in
+# runs the real script with scripted votes, no key or network needed
+# usage: python bench.py --cards 20 --latency 0.15 --runs cold warm
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def scripted_input(cards):
+    """Start the game, vote on `cards` cards, then quit. Never a double yes, so no match sleeps."""
+    return "\n" + "y\nn\n" * cards + "q\n"
+
+def run_game(base_url, workdir, cards, env_extra=None, timeout=300):
+    """Runs movie.py once, returns wall time, pool build time, time to first card and cards shown."""
+    # everything it writes stays in workdir, and a catalog from `movie.py enrich` would skip TMDb entirely
+    env = dict(os.environ, TMDB_API_KEY="standin", TMDB_BASE_URL=base_url,
+               TMDB_CACHE=os.path.join(workdir, "tmdb_cache.sqlite"),
+               LIBRARY_INDEX=os.path.join(workdir, ".letterboxd_index.json"),
+               MOVIE_CATALOG=os.path.join(workdir, "no_catalog.json"),
+               PYTHONUNBUFFERED="1", TERM=os.environ.get("TERM", "dumb"))
+    env.update(env_extra or {})
+
+    marks = {}
+    shown = 0
+    last = ""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "movie.py"], cwd=HERE, env=env, text=True, encoding="utf-8",
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    def feed():
+        # written up front, input() just reads the next line when it gets there
+        try:
+            proc.stdin.write(scripted_input(cards))
+            proc.stdin.close()
+        except OSError:
+            pass  # the game exited early, the error line says why
+    threading.Thread(target=feed, daemon=True).start()
+
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            now = time.perf_counter() - start
+            last = line.strip() or last
+            if "Movie pool successfully built" in line:
+                marks.setdefault("pool", now)
+            elif line.startswith("🎬"):
+                marks.setdefault("first_card", now)
+                shown += 1
+            elif "❌" in line:
+                marks.setdefault("error", line[line.index("❌"):].strip())
+        proc.wait()
+    finally:
+        timer.cancel()
+
+    return {
+        "wall_s": time.perf_counter() - start,
+        "pool_s": marks.get("pool"),
+        "first_card_s": marks.get("first_card"),
+        "cards": shown,
+        "exit_code": proc.returncode,
+        "error": marks.get("error") or (last if proc.returncode else None),
+    }
+
+def import_time(module="moviepicker.cli", repeat=5):
+    """Best of `repeat` fresh interpreters importing `module`, timed inside the child so startup isn't counted."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    return min(float(subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True,
+                                    capture_output=True, text=True).stdout) for _ in range(repeat))
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.3f}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark movie.py end to end against the TMDb stand-in.")
+    parser.add_argument("--cards", type=int, default=20, help="cards to vote on before quitting")
+    parser.add_argument("--runs", nargs="+", default=["cold", "warm"],
+                        help="cold starts from an empty cache, warm reuses the previous run's cache")
+    parser.add_argument("--depth", help="PREFETCH_DEPTH for movie.py")
+    parser.add_argument("--workers", help="PREFETCH_WORKERS for movie.py")
+    add_standin_args(parser)
+    args = parser.parse_args()
+
+    env_extra = {}
+    if args.depth is not None:
+        env_extra["PREFETCH_DEPTH"] = args.depth
+    if args.workers is not None:
+        env_extra["PREFETCH_WORKERS"] = args.workers
+
+    print(f"cold import of moviepicker.cli: {import_time() * 1000:.1f} ms\n")
+
+    standin = standin_from_args(args)
+    base_url = standin.start()
+
+    print(f"{'run':6} {'wall s':>8} {'pool s':>8} {'1st card s':>11} {'cards':>6} {'requests':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in args.runs:
+            if run == "cold":
+                # empty cache and index, as on a first run
+                for name in os.listdir(tmp):
+                    os.remove(os.path.join(tmp, name))
+            before = standin.requests
+            res = run_game(base_url, tmp, args.cards, env_extra)
+            print(f"{run:6} {res['wall_s']:8.3f} {_fmt(res['pool_s']):>8} {_fmt(res['first_card_s']):>11} "
+                  f"{res['cards']:6} {standin.requests - before:9}")
+            if res["error"]:
+                print(f"       {res['error']}")
+
+    standin.stop()
+    print(f"\nStand-in totals: {standin.counts}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,26 @@
+# MoviePicker as a library: pool building, TMDb metadata and the game loop
+# submodules are imported on first use, so `import moviepicker` stays instant
+import importlib
+
+_EXPORTS = {
+    "LibraryIndex": "library_index", "Film": "library_index",
+    "GroupPool": "group_pool", "load_group": "group_pool", "build_pool": "group_pool",
+    "rank": "ranking", "score": "ranking",
+    "TMDbCache": "tmdb_cache",
+    "TMDbClient": "tmdb_client", "TMDbError": "tmdb_client", "TMDbAPIError": "tmdb_client",
+    "TMDbNetworkError": "tmdb_client",
+    "Metadata": "metadata",
+    "FilterIndex": "filter_index", "parse_filters": "filter_index",
+    "load_catalog": "catalog", "save_catalog": "catalog", "enrich": "catalog",
+    "play": "game", "showdown": "game",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'moviepicker' has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
\ No newline at end of file
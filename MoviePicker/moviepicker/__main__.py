@@ -0,0 +1,3 @@
+from .cli import main
+
+raise SystemExit(main())
\ No newline at end of file
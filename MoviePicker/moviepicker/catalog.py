@@ -0,0 +1,56 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .tmdb_client import TMDbError, to_details
+
+# every film resolved against TMDb ahead of time, so the game never waits on the network
+# built by: python movie.py enrich [--all]
+
+CATALOG_VERSION = 1
+
+def load_catalog(path):
+    """film key -> card (None for films TMDb didn't find), or None if there's no catalog."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data["films"] if data.get("version") == CATALOG_VERSION else None
+
+def save_catalog(path, films):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": CATALOG_VERSION, "created": time.time(), "films": films}, f, indent=1)
+    os.replace(tmp, path)
+
+def enrich(client, films, workers=4, progress=None, runtimes=True):
+    """
+    film key -> card for every Film, searched concurrently and matched on Year.
+    With runtimes, each found film costs one more request for its runtime, so it can be filtered on.
+    Returns (cards, failures), failures maps key -> error for films that should be retried later.
+    """
+    genre_map = client.genre_map() or {}
+    cards, failures = {}, {}
+
+    def resolve(film):
+        movie = client.search(film.name, film.year)
+        if not movie:
+            return None
+        card = to_details(movie, genre_map)
+        if runtimes and card["tmdb_id"] is not None:
+            card["runtime"] = client.runtime(card["tmdb_id"])
+        return card
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(resolve, film): film for film in films}
+        for done, future in enumerate(as_completed(futures), 1):
+            film = futures[future]
+            try:
+                cards[film.key] = future.result()
+            except TMDbError as e:
+                failures[film.key] = str(e)
+            if progress:
+                progress(done, len(futures))
+    return cards, failures
\ No newline at end of file
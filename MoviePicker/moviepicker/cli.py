@@ -0,0 +1,232 @@
+import argparse
+import os
+import sys
+
+# thin entry point, heavy imports (numpy, requests) happen only once a command needs them
+# usage: python movie.py [play] [--people my,her] [--temperature 0.5]
+#        python movie.py enrich [--all]
+#        python movie.py standin [--latency 0.2]
+
+def load_env():
+    # .env is optional once there's a catalog, so is python-dotenv
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+def _env_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+def _people(value):
+    return [p.strip() for p in value.split(",") if p.strip()]
+
+def add_common_args(parser):
+    parser.add_argument("--people", type=_people, default=_people(os.getenv("MOVIE_NIGHT_PEOPLE", "my,her")),
+                        help="everyone at movie night, by csv prefix: my_watchlist.csv, her_watched.csv, ...")
+    parser.add_argument("--catalog", default=os.getenv("MOVIE_CATALOG", "catalog.json"))
+    parser.add_argument("--index", default=os.getenv("LIBRARY_INDEX", ".letterboxd_index.json"))
+    parser.add_argument("--cache", default=os.getenv("TMDB_CACHE", "tmdb_cache.sqlite"))
+    # default rule: on someone's watchlist, everyone's either seen it or wants to, and not everyone's seen it
+    parser.add_argument("--min-watchlists", type=int, default=_env_int("MIN_WATCHLISTS") or 1)
+    parser.add_argument("--max-seen", type=int, default=_env_int("MAX_SEEN"), help="default: the whole group")
+    parser.add_argument("--min-interested", type=int, default=_env_int("MIN_INTERESTED"), help="default: the whole group")
+
+def make_client(cache, pool_size=3, rate=None, burst=None, retries=4):
+    from .tmdb_client import TMDbClient, DEFAULT_BASE_URL
+    return TMDbClient(os.getenv("TMDB_API_KEY"), cache, os.getenv("TMDB_BASE_URL", DEFAULT_BASE_URL),
+                      pool_size=pool_size, rate=rate, burst=burst, retries=retries)
+
+def build(args):
+    """(films, ratings, group, pool) or None after printing why not."""
+    from .library_index import LibraryIndex
+    from .group_pool import build_pool
+
+    # films are keyed on their Letterboxd URI, so remakes don't collide on title
+    # the index only re-reads exports that changed, and only their new rows
+    library = LibraryIndex(args.index)
+    try:
+        built = build_pool(library, args.people, args.min_watchlists, args.max_seen, args.min_interested)
+    except FileNotFoundError as e:
+        print(f"❌ Error: Could not find a required file: {e.filename}")
+        return None
+    library.save()
+    return built
+
+def apply_filters(pool, filters, genre_ids, tmdb_ratings, runtimes, genre_map):
+    """The films in pool matching every filter, with a note about films there was nothing cached for."""
+    import time
+    from .filter_index import FilterIndex
+
+    index = FilterIndex([film.key for film in pool], genre_ids,
+                        {"year": {film.key: film.year for film in pool}, "rating": tmdb_ratings, "runtime": runtimes},
+                        genre_map)
+    start = time.perf_counter()
+    kept = index.apply(pool, filters)
+    elapsed = time.perf_counter() - start
+
+    unknown = ~index.known(filters[0].field)
+    for f in filters[1:]:
+        unknown |= ~index.known(f.field)
+    print(f"🔎 Filters kept {len(kept)} of {len(pool)} films ({elapsed * 1000:.2f} ms)")
+    if unknown.any():
+        print(f"⚠️ {int(unknown.sum())} films had nothing cached to filter on and were left out, "
+              f"run `python movie.py enrich` to include them.")
+    return kept
+
+def play_main(argv):
+    parser = argparse.ArgumentParser(prog="movie.py", description="Pick tonight's movie together.")
+    add_common_args(parser)
+    parser.add_argument("--offline", action="store_true", default=os.getenv("TMDB_OFFLINE", "") not in ("", "0"),
+                        help="only use cached TMDb responses, no key or network needed")
+    parser.add_argument("--depth", type=int, default=int(os.getenv("PREFETCH_DEPTH", "5")),
+                        help="cards fetched ahead of the one you're voting on")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("PREFETCH_WORKERS", "3")))
+    parser.add_argument("--temperature", type=float, default=float(os.getenv("RANK_TEMPERATURE", "0.5")),
+                        help="0 plays strictly best-first, higher adds randomness, very high is a plain shuffle")
+    parser.add_argument("--filter", action="append", default=[os.getenv("MOVIE_FILTERS", "")],
+                        help='e.g. "genre=comedy|romance", "year>2010", "rating>=7", "runtime<120", repeat or use commas')
+    args = parser.parse_args(argv)
+
+    from .filter_index import parse_filters
+    try:
+        filters = parse_filters(args.filter)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    from .catalog import load_catalog
+    from .metadata import Metadata
+    from .tmdb_cache import TMDbCache
+    from .tmdb_client import TMDbError, TMDbAPIError
+
+    # written by `movie.py enrich`, when it has every film the game never touches the network
+    catalog = load_catalog(args.catalog)
+    if not os.getenv("TMDB_API_KEY") and not args.offline and catalog is None:
+        print("❌ Error: TMDb API key not found. Make sure you have a .env file.")
+        return 1
+
+    cache = TMDbCache(args.cache, offline=args.offline)
+    try:
+        # with a catalog the client is only for films added since the last enrich
+        has_client = catalog is None or os.getenv("TMDB_API_KEY") or args.offline
+        metadata = Metadata(catalog, make_client(cache, args.workers) if has_client else None)
+        try:
+            if metadata.genre_map() is None:
+                print("❌ Genre list isn't cached yet. Run once online first.")
+                return 1
+        except TMDbError as e:
+            print(f"❌ Could not fetch genre list from TMDb: {e}")
+            return 1
+
+        built = build(args)
+        if built is None:
+            return 1
+        films, ratings, group, pool = built
+        # only what's cached, filtered-out films never cost a request
+        genre_ids, tmdb_ratings, runtimes = metadata.cached(films.values())
+        if pool and filters:
+            try:
+                pool = apply_filters(pool, filters, genre_ids, tmdb_ratings, runtimes, metadata.genre_map())
+            except ValueError as e:
+                print(f"❌ Error: {e}")
+                return 1
+        if not pool:
+            print("😢 No potential movies found based on your criteria.")
+            return 1
+        missing = metadata.missing(pool)
+        if missing:
+            fallback = "they'll be looked up on TMDb as they come up" if metadata.client else "they'll be skipped"
+            print(f"⚠️ {len(missing)} films aren't in the catalog yet, {fallback}. "
+                  f"Run `python movie.py enrich` to add them.")
+
+        from .game import play, showdown, VOTERS
+        from .ranking import rank
+
+        print(f"✅ Movie pool successfully built! Total options: {len(pool)}")
+        input("\nPress Enter to start the game...")
+
+        # likely matches first, so fewer votes and lookups before a yes/yes
+        pool = [films[key] for key in rank(group, [f.key for f in pool], ratings, genre_ids, tmdb_ratings,
+                                           temperature=args.temperature)]
+
+        voters = VOTERS if len(args.people) == 2 else [f"{person}'s vote" for person in args.people]
+        try:
+            yes_movies, game_quit = play(pool, metadata.details, args.depth, args.workers, voters)
+        except TMDbAPIError as e:
+            print(f"❌ API Error: {e}")
+            input("Press Enter to exit. Please check your API key in the .env file.")
+            return 1
+    finally:
+        cache.close()
+
+    showdown(yes_movies, game_quit)
+    return 0
+
+def enrich_main(argv):
+    parser = argparse.ArgumentParser(prog="movie.py enrich",
+                                     description="Resolve films against TMDb and write a catalog for the game.")
+    add_common_args(parser)
+    parser.add_argument("--all", action="store_true", help="every film in every csv, not just the candidate pool")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent requests")
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second, on average")
+    parser.add_argument("--burst", type=float, default=10.0, help="requests allowed back to back")
+    parser.add_argument("--retries", type=int, default=5, help="tries per request on 429/5xx before giving up")
+    args = parser.parse_args(argv)
+
+    import time
+    from .catalog import load_catalog, save_catalog, enrich
+    from .tmdb_cache import TMDbCache
+    from .tmdb_client import TMDbError
+
+    if not os.getenv("TMDB_API_KEY"):
+        print("❌ Error: TMDb API key not found. Make sure you have a .env file.")
+        return 1
+
+    built = build(args)
+    if built is None:
+        return 1
+    films, _, _, pool = built
+    targets = list(films.values()) if args.all else pool
+
+    cache = TMDbCache(args.cache)
+    client = make_client(cache, args.workers, args.rate, args.burst, args.retries)
+
+    # keep what an earlier run already resolved, for films outside this run's targets too
+    catalog = load_catalog(args.catalog) or {}
+    start = time.perf_counter()
+    try:
+        cards, failures = enrich(client, targets, args.workers,
+                                 lambda done, total: print(f"\r🔎 {done}/{total}", end="", flush=True))
+    except TMDbError as e:
+        print(f"\n❌ Could not fetch genre list from TMDb: {e}")
+        return 1
+    finally:
+        cache.close()
+    catalog.update(cards)
+    save_catalog(args.catalog, catalog)
+
+    found = sum(1 for card in cards.values() if card)
+    print(f"\n✅ {found}/{len(targets)} films resolved in {time.perf_counter() - start:.1f}s "
+          f"({cache.requests} requests, {client.retried} retries) -> {args.catalog}")
+    if failures:
+        print(f"⚠️ {len(failures)} failed and weren't saved, run again to retry them:")
+        for key, error in list(failures.items())[:10]:
+            print(f"   {films[key].name}: {error}")
+    return 0
+
+def standin_main(argv):
+    from .tmdb_standin import main
+    main(argv)
+    return 0
+
+COMMANDS = {"play": play_main, "enrich": enrich_main, "standin": standin_main}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    load_env()
+    command = play_main
+    if argv and argv[0] in COMMANDS:
+        command = COMMANDS[argv.pop(0)]
+    return command(argv)
\ No newline at end of file
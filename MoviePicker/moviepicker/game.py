@@ -0,0 +1,107 @@
+import os
+import random
+import time
+
+from .prefetch import Prefetcher
+from .tmdb_client import TMDbNetworkError
+
+VOTERS = ["Your vote", "Your girlfriend's vote"]
+
+def get_valid_input(prompt):
+    """
+    NEW: A function to ensure the user input is valid.
+    It will loop until 'y', 'n', or 'q' is entered.
+    """
+    while True:
+        vote = input(prompt).lower().strip()
+        if vote in ['y', 'n', 'q']:
+            return vote
+        else:
+            print("Invalid input. Please enter 'y', 'n', or 'q'.")
+
+def clear_screen():
+    os.system('cls' if os.name == 'nt' else 'clear')
+
+def show_card(details):
+    print("--------------------------------------------------")
+    print(f"🎬 {details['title']} ({details['release_date'][:4]})")
+    print(f"⭐ TMDb Rating: {details['rating']}/10")
+    print(f"🎭 Genres: {', '.join(details['genres'])}")
+    if details.get('runtime'):
+        print(f"⏱️ Runtime: {details['runtime']} min")
+    print("--------------------------------------------------")
+    print(f"Synopsis: {details['overview']}\n")
+
+def play(pool, fetch, depth=5, workers=3, voters=VOTERS):
+    """
+    The voting rounds. fetch(film) -> card or None, run ahead on a Prefetcher.
+    Returns (yes_movies, game_quit). TMDbAPIError from fetch is raised, after the
+    prefetcher's been shut down.
+    """
+    yes_movies = []
+    game_quit = False
+
+    # the next few cards load in the background while you vote
+    prefetcher = Prefetcher(pool, fetch, depth=depth, workers=workers)
+    try:
+        for i, film in enumerate(pool):
+            clear_screen()
+            try:
+                details = prefetcher.get(i)
+            except TMDbNetworkError as e:
+                print(f"❌ Network Error: Could not connect to TMDb. {e}")
+                details = None
+
+            if not details:
+                print(f"Could not fetch details for {film.name}. Skipping.")
+                input("Press Enter to continue...")
+                continue
+
+            show_card(details)
+
+            votes = []
+            for voter in voters:
+                vote = get_valid_input(f"{voter} (y/n/q): ")
+                if vote == 'q':
+                    game_quit = True
+                    break
+                votes.append(vote)
+            if game_quit:
+                break
+
+            if all(vote == 'y' for vote in votes):
+                yes_movies.append(details)
+                print(f"\n✅ Match! '{details['title']}' added to the final showdown.")
+                time.sleep(2)
+    finally:
+        # quitting drops whatever was still queued
+        prefetcher.close()
+    return yes_movies, game_quit
+
+def showdown(yes_movies, game_quit):
+    clear_screen()
+
+    if game_quit:
+        print("👋 Game quit. See you next time!")
+    elif not yes_movies:
+        print("😢 Looks like you didn't agree on any movies tonight.")
+    elif len(yes_movies) == 1:
+        winner = yes_movies[0]
+        print("🎉 You have a clear winner! 🎉")
+        print(f"\nTonight's movie is: {winner['title']}")
+    else:
+        print("--- 🏆 FINAL SHOWDOWN 🏆 ---")
+        print("You agreed on multiple movies! Here are the finalists:\n")
+        for movie in yes_movies:
+            print(f"- {movie['title']}")
+
+        print("\nPicking a random winner in 3...")
+        time.sleep(1)
+        print("2...")
+        time.sleep(1)
+        print("1...")
+        time.sleep(1)
+
+        winner = random.choice(yes_movies)
+        print("\n🎉 The winner of the tiebreak is... 🎉")
+        print(f"\nTonight's movie is: {winner['title']}")
\ No newline at end of file
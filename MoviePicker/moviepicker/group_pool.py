@@ -0,0 +1,86 @@
+import numpy as np
+
+class GroupPool:
+    """
+    Candidate pools for a group of any size.
+    Films are interned to integer ids and each person's watchlist and watched
+    lists are rows of a bool matrix, so a pool rule is a few column sums.
+    """
+    def __init__(self):
+        self.ids = {}      # film key -> id
+        self.keys = []     # id -> film key
+        self.people = []
+        self._lists = []   # per person (watchlist ids, watched ids)
+        self._matrices = None
+
+    def intern(self, key):
+        film_id = self.ids.get(key)
+        if film_id is None:
+            film_id = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+        return film_id
+
+    def add_person(self, name, watchlist, watched):
+        """watchlist and watched are iterables of film keys, ratings count as watched."""
+        self.people.append(name)
+        self._lists.append((np.fromiter((self.intern(k) for k in watchlist), dtype=np.int64),
+                            np.fromiter((self.intern(k) for k in watched), dtype=np.int64)))
+        self._matrices = None
+
+    def matrices(self):
+        """(watchlist, watched) as people x films bool arrays."""
+        if self._matrices is None:
+            shape = (len(self.people), len(self.keys))
+            wants, seen = np.zeros(shape, dtype=bool), np.zeros(shape, dtype=bool)
+            for row, (wl, wd) in enumerate(self._lists):
+                wants[row, wl] = True
+                seen[row, wd] = True
+            self._matrices = (wants, seen)
+        return self._matrices
+
+    def mask(self, min_watchlists=1, max_seen=None, min_interested=None):
+        """
+        Bool mask over film ids: on at least min_watchlists watchlists, seen by fewer
+        than max_seen people, and wanted or seen by at least min_interested people.
+        max_seen and min_interested default to the whole group, which for two people is
+        the original rule: mutual watchlist, or one has seen what the other wants,
+        minus anything you've both seen.
+        """
+        n = len(self.people)
+        max_seen = n if max_seen is None else max_seen
+        min_interested = n if min_interested is None else min_interested
+
+        wants, seen = self.matrices()
+        on_watchlists = wants.sum(axis=0)
+        seen_by = seen.sum(axis=0)
+        interested = (wants | seen).sum(axis=0)
+        return (on_watchlists >= min_watchlists) & (seen_by < max_seen) & (interested >= min_interested)
+
+    def pool(self, min_watchlists=1, max_seen=None, min_interested=None):
+        """Film keys that pass the rule, see mask()."""
+        return [self.keys[i] for i in np.flatnonzero(self.mask(min_watchlists, max_seen, min_interested))]
+
+def load_group(library, people):
+    """
+    (films by key, ratings per person, GroupPool) from each person's exports,
+    found by prefix: my_watchlist.csv, my_watched.csv, my_ratings.csv. Ratings count as watched.
+    """
+    films, ratings, group = {}, {}, GroupPool()
+    for person in people:
+        lists = {kind: library.films(f"{person}_{kind}.csv") for kind in ("watchlist", "watched", "ratings")}
+        for film in lists["watchlist"] + lists["watched"] + lists["ratings"]:
+            films.setdefault(film.key, film)
+        ratings[person] = {f.key: f.rating for f in lists["ratings"] if f.rating is not None}
+        group.add_person(person, (f.key for f in lists["watchlist"]),
+                         (f.key for f in lists["watched"] + lists["ratings"]))
+    return films, ratings, group
+
+def build_pool(library, people, min_watchlists=1, max_seen=None, min_interested=None):
+    """
+    (films, ratings, group, pool) for a movie night, pool being the candidate Films
+    sorted by title then year. See GroupPool.mask for the rule.
+    """
+    films, ratings, group = load_group(library, people)
+    keys = group.pool(min_watchlists, max_seen, min_interested)
+    pool = sorted((films[key] for key in keys), key=lambda film: (film.name, film.year or 0))
+    return films, ratings, group, pool
\ No newline at end of file
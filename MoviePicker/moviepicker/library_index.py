@@ -0,0 +1,101 @@
+import csv
+import hashlib
+import io
+import json
+import os
+from collections import namedtuple
+
+Film = namedtuple("Film", "key name year rating")
+
+INDEX_VERSION = 2
+CHUNK_BYTES = 1 << 20
+
+def film_key(row):
+    # the uri is unique per film, remakes with the same title get different ones
+    uri = (row.get("Letterboxd URI") or "").strip()
+    return uri or f"{row['Name']}|{row.get('Year') or ''}"
+
+class LibraryIndex:
+    """
+    Persistent index over Letterboxd CSV exports, one entry per file.
+    Films are keyed on their Letterboxd URI, or (Name, Year) if a row has none.
+    An unchanged file (same size and mtime) isn't opened at all. One that only grew,
+    which is what a new export looks like, has just the new rows parsed, after checking
+    the part already read hashes the same. Any other change re-reads the whole file.
+    """
+    def __init__(self, path=".letterboxd_index.json"):
+        self.path = path
+        self.files = {}
+        self.dirty = False
+        self.rows_read = 0  # rows parsed this run, for the curious
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.files = data["files"]
+        except (OSError, ValueError, KeyError):
+            pass  # missing or broken index, everything gets read once
+
+    def _digest(self, f, end):
+        # sha1 of everything before end, hashing is cheap next to parsing the rows
+        # a same-length edit in the middle (a re-rating) changes it, a sample of the file wouldn't
+        h = hashlib.sha1()
+        f.seek(0)
+        left = end
+        while left > 0:
+            chunk = f.read(min(left, CHUNK_BYTES))
+            if not chunk:
+                break
+            h.update(chunk)
+            left -= len(chunk)
+        return h
+
+    def films(self, csv_path):
+        """Every film in a CSV, re-reading as little of it as possible."""
+        st = os.stat(csv_path)
+        entry = self.files.get(csv_path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return [Film(*row) for row in entry["rows"]]
+
+        with open(csv_path, "rb") as f:
+            header = f.readline()
+            digest = self._digest(f, entry["offset"]) if entry and st.st_size >= entry["offset"] else None
+            appended = digest is not None and digest.hexdigest() == entry["fingerprint"]
+            rows = entry["rows"] if appended else []
+            start = entry["offset"] if appended else len(header)
+            if not appended:
+                digest = self._digest(f, start)
+
+            f.seek(start)
+            data = f.read()
+            offset = start + len(data)
+            # the digest carries on over the new bytes, so the file is only hashed once
+            digest.update(data)
+            fingerprint = digest.hexdigest()
+
+        fields = next(csv.reader([header.decode("utf-8-sig")]))
+        for row in csv.DictReader(io.StringIO(data.decode("utf-8")), fieldnames=fields):
+            if not row.get("Name"):
+                continue
+            self.rows_read += 1
+            rating = row.get("Rating")
+            year = int(row["Year"]) if (row.get("Year") or "").isdigit() else None
+            rows.append([film_key(row), row["Name"], year, float(rating) if rating else None])
+
+        self.files[csv_path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "offset": offset,
+                                "fingerprint": fingerprint, "rows": rows}
+        self.dirty = True
+        return [Film(*row) for row in rows]
+
+    def keys(self, *csv_paths):
+        return {film.key for path in csv_paths for film in self.films(path)}
+
+    def save(self):
+        if not self.dirty:
+            return
+        # written to the side first so a crash never leaves half an index
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self.dirty = False
\ No newline at end of file
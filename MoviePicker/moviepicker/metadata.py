@@ -0,0 +1,64 @@
+class Metadata:
+    """
+    Cards and ranking metadata for Films. Everything comes from the catalog
+    when there is one, otherwise from TMDb through the cache, matched on Year.
+    With both, films added since the catalog was built fall back to TMDb.
+    """
+    def __init__(self, catalog=None, client=None):
+        self.catalog = catalog
+        self.client = client
+        self._genre_map = None
+
+    def genre_map(self):
+        """Genre id -> name, None if offline with nothing cached. Raises TMDbError."""
+        if self._genre_map is None and self.catalog is not None:
+            # cards in the catalog already have genre names, this is just for looking them up
+            self._genre_map = {gid: name for card in self.catalog.values() if card
+                               for gid, name in zip(card.get('genre_ids', []), card['genres'])}
+        if self._genre_map is None:
+            self._genre_map = self.client.genre_map()
+        return self._genre_map
+
+    def details(self, film):
+        """
+        The card for a Film, or None if TMDb doesn't know it.
+        Runs on the prefetch threads, so errors are raised for the game loop to report.
+        """
+        if self.catalog is not None and (film.key in self.catalog or self.client is None):
+            return self.catalog.get(film.key)
+        from .tmdb_client import to_details
+        movie = self.client.search(film.name, film.year)
+        if not movie:
+            return None
+        # the catalog's genre map only has genres some catalog film has
+        genre_map = self.client.genre_map() if self.catalog is not None else self.genre_map()
+        card = to_details(movie, genre_map or {})
+        card["runtime"] = self.client.runtime(card["tmdb_id"], cached_only=True)
+        return card
+
+    def missing(self, films):
+        """The films the catalog doesn't have, none without a catalog."""
+        if self.catalog is None:
+            return []
+        return [film for film in films if film.key not in self.catalog]
+
+    def cached(self, films):
+        """
+        (genre ids, TMDb ratings, runtimes) by film key for whatever's already known.
+        Never hits the network, so filtering and ranking don't cost a request per film.
+        """
+        genres, votes, runtimes = {}, {}, {}
+        for film in films:
+            if self.catalog is not None and (film.key in self.catalog or self.client is None):
+                card = self.catalog.get(film.key)
+                movie = card and {'genre_ids': card.get('genre_ids', []), 'vote_average': card['rating'],
+                                  'runtime': card.get('runtime')}
+            else:
+                movie = self.client.search(film.name, film.year, cached_only=True)
+                if movie and movie.get('id') is not None:
+                    movie = dict(movie, runtime=self.client.runtime(movie['id'], cached_only=True))
+            if movie:
+                genres[film.key] = movie.get('genre_ids', [])
+                votes[film.key] = movie.get('vote_average')
+                runtimes[film.key] = movie.get('runtime')
+        return genres, votes, runtimes
\ No newline at end of file
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+class Prefetcher:
+    """
+    Fetches the next few items of a list in the background.
+    get(i) waits for item i (usually already done) and queues up to i + depth.
+    Errors from fetch are raised by get() on the main thread.
+    """
+    def __init__(self, items, fetch, depth=5, workers=3):
+        self.items = items
+        self.fetch = fetch
+        self.depth = max(0, depth)
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch")
+        self.futures = {}
+        self.queued = 0  # everything below this has been submitted
+        self.closed = False
+        self._fill(0)
+
+    def _fill(self, i):
+        end = min(len(self.items), i + 1 + self.depth)
+        while self.queued < end:
+            self.futures[self.queued] = self.pool.submit(self._run, self.items[self.queued])
+            self.queued += 1
+
+    def _run(self, item):
+        # skipped if we were closed while it sat in the queue
+        if self.closed:
+            return None
+        return self.fetch(item)
+
+    def get(self, i):
+        self._fill(i)
+        return self.futures.pop(i).result()
+
+    def close(self):
+        """Cancels anything not started yet. Requests already in flight finish on their own."""
+        self.closed = True
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
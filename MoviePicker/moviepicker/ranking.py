@@ -0,0 +1,86 @@
+import numpy as np
+
+# how much each signal counts, all of them are scaled to roughly -1..1 first
+WEIGHTS = {"watchlists": 1.0, "rated": 1.5, "genres": 1.0, "tmdb": 0.5}
+
+def taste_similarity(centered, rated):
+    """
+    people x people agreement, cosine of mean-centered ratings over films both have rated.
+    centered has zeros where rated is False.
+    """
+    num = centered @ centered.T
+    # each person's spread, counted only over films the other one also rated
+    spread = (centered ** 2) @ rated.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sim = num / np.sqrt(spread * spread.T)
+    return np.nan_to_num(sim)
+
+def score(group, candidates, ratings, genres=None, tmdb_ratings=None, weights=None):
+    """
+    One score per candidate key, higher is a likelier match. All candidates in one pass.
+    ratings: person -> {film key: stars}, people missing from it just haven't rated anything
+    genres: film key -> list of genre ids, from whatever metadata is already cached
+    tmdb_ratings: film key -> TMDb vote average, also from the cache
+    """
+    weights = dict(WEIGHTS, **(weights or {}))
+    genres = genres or {}
+    tmdb_ratings = tmdb_ratings or {}
+    n_people, n_films = len(group.people), len(group.keys)
+    cand = np.fromiter((group.ids[k] for k in candidates), dtype=np.int64, count=len(candidates))
+
+    # people x films star ratings, nan where unrated
+    stars = np.full((n_people, n_films), np.nan)
+    for row, person in enumerate(group.people):
+        for key, value in ratings.get(person, {}).items():
+            if key in group.ids and value is not None:
+                stars[row, group.ids[key]] = value
+    rated = ~np.isnan(stars)
+    counts = rated.sum(axis=1, keepdims=True)
+    means = np.divide(np.nansum(stars, axis=1, keepdims=True), counts,
+                      out=np.zeros((n_people, 1)), where=counts > 0)
+    centered = np.where(rated, stars - means, 0.0)
+
+    # more watchlists, more people who'll say yes
+    wants, seen = group.matrices()
+    total = weights["watchlists"] * wants[:, cand].mean(axis=0)
+
+    # someone's seen it and loved (or hated) it, trusted more the more their taste
+    # agrees with the people who haven't seen it yet
+    sim = taste_similarity(centered, rated.astype(float))
+    unseen = ~seen[:, cand]
+    trust = np.divide((1 + sim) / 2 @ unseen, unseen.sum(axis=0), out=np.full((n_people, len(cand)), 0.5),
+                      where=unseen.sum(axis=0) > 0)
+    total += weights["rated"] * np.clip((centered[:, cand] * trust).sum(axis=0) / 2.5, -1, 1)
+
+    # genre affinity, each person's average centered rating per genre
+    genre_ids = sorted({g for ids in genres.values() for g in ids})
+    if genre_ids:
+        col = {g: i for i, g in enumerate(genre_ids)}
+        tagged = np.zeros((n_films, len(genre_ids)))
+        for key, ids in genres.items():
+            if key in group.ids:
+                tagged[group.ids[key], [col[g] for g in ids]] = 1.0
+        per_genre = rated.astype(float) @ tagged
+        affinity = np.divide(centered @ tagged, per_genre, out=np.zeros_like(per_genre), where=per_genre > 0)
+        n_tags = tagged[cand].sum(axis=1)
+        fit = np.divide(affinity @ tagged[cand].T, n_tags, out=np.zeros((n_people, len(cand))), where=n_tags > 0)
+        total += weights["genres"] * np.clip(fit.mean(axis=0) / 2.5, -1, 1)
+
+    vote = np.array([tmdb_ratings.get(k, np.nan) for k in candidates], dtype=float)
+    total += weights["tmdb"] * np.nan_to_num(np.clip((vote - 6.5) / 2, -1, 1))
+    return total
+
+def rank(group, candidates, ratings, genres=None, tmdb_ratings=None, temperature=0.5, seed=None, weights=None):
+    """
+    Candidates best first. temperature 0 is strictly by score, higher mixes things up
+    (sampling without replacement in proportion to exp(score / temperature)), very high is a shuffle.
+    """
+    candidates = list(candidates)
+    if not candidates:
+        return []
+    scores = score(group, candidates, ratings, genres, tmdb_ratings, weights)
+    if temperature > 0:
+        # gumbel top-k, one sort instead of n weighted draws
+        scores = scores / temperature + np.random.default_rng(seed).gumbel(size=len(candidates))
+    order = np.argsort(-scores, kind="stable")
+    return [candidates[i] for i in order]
\ No newline at end of file
@@ -0,0 +1,80 @@
+import json
+import sqlite3
+import threading
+import time
+
+# how long each kind of response stays fresh, in seconds
+GENRE_TTL = 30 * 24 * 3600
+DETAILS_TTL = 7 * 24 * 3600
+MISS_TTL = 24 * 3600  # titles with no results, they might get added later
+
+def normalize(query):
+    # "The  Thing " and "the thing" are the same search
+    return " ".join(query.casefold().split())
+
+class TMDbCache:
+    """
+    Persistent cache of TMDb responses in SQLite, keyed by normalized query.
+    None is a valid cached value, so titles with no results aren't searched again.
+    Offline mode never expires anything and never hits the network.
+    Safe to share between the prefetch threads.
+    """
+    def __init__(self, path="tmdb_cache.sqlite", max_entries=5000, offline=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.offline = offline
+        self.requests = 0  # network requests made, for the curious
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body TEXT, expires REAL, used REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses(used)")
+        self.db.commit()
+
+    def get(self, key):
+        """Returns (hit, value). Expired entries are a miss unless we're offline."""
+        with self.lock:
+            if self.db is None:
+                return False, None
+            row = self.db.execute("SELECT body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (row[1] < time.time() and not self.offline):
+                return False, None
+            self.db.execute("UPDATE responses SET used = ? WHERE key = ?", (time.time(), key))
+        return True, json.loads(row[0])
+
+    def put(self, key, value, ttl):
+        now = time.time()
+        with self.lock:
+            # late writes from prefetch threads after close() are dropped
+            if self.db is None:
+                return
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (key, body, expires, used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now),
+            )
+            self._evict()
+            self.db.commit()
+
+    def note_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def _evict(self):
+        # least recently used entries go first once we're over the cap
+        (count,) = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            self.db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.commit()
+                self.db.close()
+                self.db = None
\ No newline at end of file
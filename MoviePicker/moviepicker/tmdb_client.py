@@ -0,0 +1,160 @@
+import random
+import threading
+import time
+
+from .tmdb_cache import normalize, GENRE_TTL, DETAILS_TTL, MISS_TTL
+
+DEFAULT_BASE_URL = "https://api.themoviedb.org/3"
+
+class TMDbError(Exception):
+    pass
+
+class TMDbAPIError(TMDbError):
+    """A response we can't fix by waiting, like a bad API key."""
+
+class TMDbNetworkError(TMDbError):
+    """Couldn't reach TMDb at all, even after retrying."""
+
+class TokenBucket:
+    """Allows `rate` requests a second on average with bursts up to `capacity`. Thread safe."""
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def release_year(movie):
+    date = movie.get('release_date') or ""
+    return int(date[:4]) if date[:4].isdigit() else None
+
+def pick_result(results, year=None):
+    """
+    The search result that's most likely the film we mean. With a year, an exact
+    match beats one a year off (festival vs release dates), which beats TMDb's order.
+    """
+    if not results:
+        return None
+    if year:
+        for tolerance in (0, 1):
+            for movie in results:
+                found = release_year(movie)
+                if found is not None and abs(found - year) <= tolerance:
+                    return movie
+    return results[0]
+
+class TMDbClient:
+    """
+    The TMDb calls MoviePicker needs, through the response cache.
+    429s, 5xxs and dropped connections are retried with exponential backoff
+    (Retry-After wins when the server sends one). Anything else raises TMDbAPIError.
+    requests is only imported once a client is made, catalog-only runs never need it.
+    """
+    def __init__(self, api_key, cache, base_url=DEFAULT_BASE_URL, pool_size=3, rate=None, burst=None,
+                 retries=4, backoff=0.5, timeout=10):
+        self.api_key = api_key
+        self.cache = cache
+        self.base_url = base_url.rstrip("/")
+        self.limiter = TokenBucket(rate, burst) if rate else None
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.retried = 0
+        import requests
+        self._requests = requests
+        # one pooled session, so worker threads reuse connections
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(1, pool_size))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+    def get(self, path, **params):
+        """JSON body of a GET, after any retries."""
+        for attempt in range(self.retries + 1):
+            if self.limiter:
+                self.limiter.acquire()
+            self.cache.note_request()
+            try:
+                response = self.session.get(f"{self.base_url}{path}", params=dict(params, api_key=self.api_key),
+                                            timeout=self.timeout)
+            except (self._requests.ConnectionError, self._requests.Timeout) as e:
+                if attempt == self.retries:
+                    raise TMDbNetworkError(e) from e
+                response = None
+            except self._requests.RequestException as e:
+                raise TMDbNetworkError(e) from e
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                if (response.status_code != 429 and response.status_code < 500) or attempt == self.retries:
+                    try:
+                        message = response.json().get('status_message', 'Unknown API error.')
+                    except ValueError:
+                        message = 'Unknown API error.'
+                    raise TMDbAPIError(f"{message} (Status Code: {response.status_code})")
+            self.retried += 1
+            time.sleep(self._delay(attempt, response))
+
+    def genre_map(self):
+        """Genre id -> name, or None if it isn't cached and we're offline."""
+        hit, genres = self.cache.get("genres")
+        if not hit:
+            if self.cache.offline:
+                return None
+            genres = self.get("/genre/movie/list")['genres']
+            self.cache.put("genres", genres, GENRE_TTL)
+        return {genre['id']: genre['name'] for genre in genres}
+
+    def search_results(self, title, cached_only=False):
+        """All search results for a title, cached (misses included) so any year can be picked later."""
+        key = f"results:{normalize(title)}"
+        hit, results = self.cache.get(key)
+        if hit or cached_only or self.cache.offline:
+            return results or []
+        # network errors aren't cached, it might be back next time
+        results = self.get("/search/movie", query=title)['results']
+        self.cache.put(key, results, DETAILS_TTL if results else MISS_TTL)
+        return results
+
+    def search(self, title, year=None, cached_only=False):
+        return pick_result(self.search_results(title, cached_only), year)
+
+    def runtime(self, tmdb_id, cached_only=False):
+        """Runtime in minutes, None if unknown. Search results don't have it, so it's a call per film."""
+        key = f"runtime:{tmdb_id}"
+        hit, runtime = self.cache.get(key)
+        if hit or cached_only or self.cache.offline:
+            return runtime
+        runtime = self.get(f"/movie/{tmdb_id}").get('runtime') or None
+        self.cache.put(key, runtime, DETAILS_TTL)
+        return runtime
+
+def to_details(movie, genre_map):
+    """The card the game shows, from one search result."""
+    return {
+        "title": movie.get('title', 'N/A'),
+        "overview": movie.get('overview', 'No overview available.'),
+        "rating": movie.get('vote_average', 0),
+        "release_date": movie.get('release_date', 'N/A'),
+        "genres": [genre_map.get(gid, 'Unknown') for gid in movie.get('genre_ids', [])],
+        "genre_ids": movie.get('genre_ids', []),
+        "tmdb_id": movie.get('id'),
+    }
\ No newline at end of file
@@ -0,0 +1,210 @@
+import argparse
+import csv
+import json
+import random
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from .tmdb_cache import normalize
+
+# local stand-in for the TMDb endpoints movie.py uses
+# usage: python movie.py standin --fixtures fixtures.json --latency 0.2
+#        then run movie.py with TMDB_BASE_URL=http://127.0.0.1:8787/3
+
+GENRES = [
+    {"id": 28, "name": "Action"}, {"id": 12, "name": "Adventure"}, {"id": 16, "name": "Animation"},
+    {"id": 35, "name": "Comedy"}, {"id": 80, "name": "Crime"}, {"id": 18, "name": "Drama"},
+    {"id": 14, "name": "Fantasy"}, {"id": 27, "name": "Horror"}, {"id": 9648, "name": "Mystery"},
+    {"id": 10749, "name": "Romance"}, {"id": 878, "name": "Science Fiction"}, {"id": 53, "name": "Thriller"},
+]
+
+def fixtures_from_cache(path):
+    """Recorded responses from a TMDbCache file, so a real session can be replayed."""
+    db = sqlite3.connect(path)
+    fixtures = {"genres": GENRES, "search": {}, "runtimes": {}}
+    for key, body in db.execute("SELECT key, body FROM responses"):
+        value = json.loads(body)
+        if key == "genres":
+            fixtures["genres"] = value
+        elif key.startswith("results:"):
+            fixtures["search"][key[len("results:"):]] = value or []
+        elif key.startswith("runtime:"):
+            fixtures["runtimes"][key[len("runtime:"):]] = value
+        elif key.startswith("search:"):
+            # older caches kept only the first result
+            fixtures["search"].setdefault(key[len("search:"):], [value] if value else [])
+    db.close()
+    return fixtures
+
+def fixtures_from_csvs(paths, seed=0):
+    """Made-up but stable results for every title in the exports, for when nothing's been recorded."""
+    rng = random.Random(seed)
+    fixtures = {"genres": GENRES, "search": {}, "runtimes": {}}
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                query = normalize(row["Name"])
+                if query in fixtures["search"]:
+                    continue
+                fixtures["search"][query] = [{
+                    "id": len(fixtures["search"]) + 1,
+                    "title": row["Name"],
+                    "overview": f"A stand-in overview for {row['Name']}.",
+                    "vote_average": round(rng.uniform(5, 9), 1),
+                    "release_date": f"{row.get('Year') or '2000'}-01-01",
+                    "genre_ids": rng.sample([g["id"] for g in GENRES], 2),
+                }]
+                fixtures["runtimes"][str(len(fixtures["search"]))] = rng.randint(80, 180)
+    return fixtures
+
+class StandIn:
+    """
+    Serves fixtures over HTTP with optional latency, errors and rate limits.
+    Counts every request so a benchmark can report them.
+    """
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, error_rate=0.0, error_code=500,
+                 rate_limit=None, retry_after=1, seed=0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.rate_limit = rate_limit  # requests per second before answering 429
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"genre": 0, "search": 0, "movie": 0, "errors": 0, "rate_limited": 0}
+        self._window = (0, 0)  # (second, requests in it)
+        self.server = None
+
+    def _limited(self):
+        if self.rate_limit is None:
+            return False
+        now = int(time.monotonic())
+        second, n = self._window
+        n = n + 1 if second == now else 1
+        self._window = (now, n)
+        return n > self.rate_limit
+
+    def respond(self, path, query):
+        """(status, headers, body) for one request, latency not included."""
+        with self.lock:
+            if self._limited():
+                self.counts["rate_limited"] += 1
+                return 429, {"Retry-After": str(self.retry_after)}, {
+                    "status_code": 25, "status_message": "Your request count is over the allowed limit."}
+            if self.error_rate and self.rng.random() < self.error_rate:
+                self.counts["errors"] += 1
+                return self.error_code, {}, {"status_code": 11, "status_message": "Internal error: stand-in failure."}
+
+            if path.endswith("/genre/movie/list"):
+                self.counts["genre"] += 1
+                return 200, {}, {"genres": self.fixtures["genres"]}
+            if path.endswith("/search/movie"):
+                self.counts["search"] += 1
+                results = self.fixtures["search"].get(normalize(query.get("query", [""])[0]), [])
+                return 200, {}, {"page": 1, "results": results, "total_results": len(results), "total_pages": 1}
+            movie_id = path.rstrip("/").rsplit("/movie/", 1)[-1]
+            if "/movie/" in path and movie_id.isdigit():
+                self.counts["movie"] += 1
+                runtime = self.fixtures.get("runtimes", {}).get(movie_id)
+                if runtime is not None:
+                    return 200, {}, {"id": int(movie_id), "runtime": runtime}
+        return 404, {}, {"status_code": 34, "status_message": "The resource you requested could not be found."}
+
+    def _delay(self):
+        with self.lock:
+            delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def start(self, host="127.0.0.1", port=0):
+        """Serves on a background thread, returns the base url to hand to movie.py."""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                standin._delay()
+                status, headers, body = standin.respond(url.path, parse_qs(url.query))
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/3"
+
+    @property
+    def requests(self):
+        return sum(self.counts.values())
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+def load_fixtures(path=None, csvs=()):
+    if path is None:
+        return fixtures_from_csvs(csvs)
+    if path.endswith((".sqlite", ".db")):
+        return fixtures_from_cache(path)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+CSVS = ["my_watchlist.csv", "my_watched.csv", "my_ratings.csv",
+        "her_watchlist.csv", "her_watched.csv", "her_ratings.csv"]
+
+def add_standin_args(parser):
+    parser.add_argument("--fixtures", help="fixture json, or a tmdb_cache.sqlite to replay (default: made up from the csvs)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds, random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-code", type=int, default=500)
+    parser.add_argument("--rate-limit", type=int, help="requests per second before answering 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+
+def standin_from_args(args):
+    return StandIn(load_fixtures(args.fixtures, CSVS), args.latency, args.jitter, args.error_rate,
+                   args.error_code, args.rate_limit, args.retry_after, args.seed)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="movie.py standin", description="Serve a local stand-in for the TMDb API.")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--save-fixtures", help="write the fixtures to a json file and exit")
+    add_standin_args(parser)
+    args = parser.parse_args(argv)
+
+    standin = standin_from_args(args)
+    if args.save_fixtures:
+        with open(args.save_fixtures, "w", encoding="utf-8") as f:
+            json.dump(standin.fixtures, f, indent=2)
+        print(f"✅ Saved {len(standin.fixtures['search'])} titles to {args.save_fixtures}")
+        return
+
+    url = standin.start(port=args.port)
+    print(f"🎬 TMDb stand-in at {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        standin.stop()
+        print(f"\n{standin.requests} requests served: {standin.counts}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
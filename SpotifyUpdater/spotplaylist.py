@@ -10,22 +10,41 @@ CLIENT_SECRET = 'eb38eeaa904a49e7ac3efbdf8cff3aa7'
 REDIRECT_URI = 'http://localhost:8888/callback'
 PLAYLIST_ID = '7IiYMwxKoXoM9YOtodr5fA'
 SCOPE = 'playlist-modify-public'
+POLL_SECONDS = 60
+# 'snapshot_id' asks Spotify for the playlist's version first and only lists the tracks when it changed,
+# 'hash' lists every track on every poll
+CHANGE_DETECTION = 'snapshot_id'
+# only the fields update_playlist_description reads, 100 is the most Spotify returns per page
+ITEM_FIELDS = 'items(track(id,duration_ms)),next'
+
+def make_client(**kwargs):
+    """A Spotify client for our app, kwargs go to spotipy.Spotify (retries, timeouts...)."""
+    return spotipy.Spotify(auth_manager=SpotifyOAuth(
+        client_id=CLIENT_ID,
+        client_secret=CLIENT_SECRET,
+        redirect_uri=REDIRECT_URI,
+        scope=SCOPE
+    ), **kwargs)
 
 # Create a Spotify client
-sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
-    client_id=CLIENT_ID,
-    client_secret=CLIENT_SECRET,
-    redirect_uri=REDIRECT_URI,
-    scope=SCOPE
-))
+sp = make_client()
+
+def get_snapshot_id(playlist_id=PLAYLIST_ID, client=None):
+    """One tiny request: the playlist's version, which changes whenever the playlist does."""
+    client = client or sp
+    return client.playlist(playlist_id, fields='snapshot_id')['snapshot_id']
 
-def get_playlist_snapshot():
+def get_playlist_snapshot(playlist_id=PLAYLIST_ID, client=None):
     """Fetches all tracks from the playlist and returns a hash snapshot and the track list."""
-    results = sp.playlist_items(PLAYLIST_ID)
-    tracks = results['items']
-    while results['next']:
-        results = sp.next(results)
+    client = client or sp
+    # Page by offset rather than sp.next(), so every page keeps the field filter.
+    tracks = []
+    while True:
+        results = client.playlist_items(playlist_id, fields=ITEM_FIELDS, limit=100, offset=len(tracks),
+                                    additional_types=('track',))
         tracks.extend(results['items'])
+        if not results['next'] or not results['items']:
+            break
     
     # Create a list of track IDs
     track_ids = [item.get('track', {}).get('id') for item in tracks if item.get('track')]
@@ -34,8 +53,8 @@ def get_playlist_snapshot():
     snapshot_hash = hashlib.md5(json.dumps(sorted(track_ids)).encode()).hexdigest()
     return snapshot_hash, tracks
 
-def update_playlist_description(tracks):
-    """Calculates total duration and updates the playlist description."""
+def describe(tracks):
+    """The description for a track list: its total duration."""
     # Calculate total duration (in milliseconds)
     total_ms = 0
     for item in tracks:
@@ -50,24 +69,41 @@ def update_playlist_description(tracks):
     seconds = total_seconds % 60
     
     # Format the description string
-    description = f"{hours}hr {minutes}min edge session"
-    
-    # Update the playlist description
-    sp.playlist_change_details(PLAYLIST_ID, description=description)
+    return f"{hours}hr {minutes}min edge session"
+
+def update_playlist_description(tracks, playlist_id=PLAYLIST_ID, client=None):
+    """Calculates total duration and updates the playlist description."""
+    client = client or sp
+    client.playlist_change_details(playlist_id, description=describe(tracks))
     print("Playlist description updated!")
 
-# Main loop: take an initial snapshot and check periodically for changes.
-last_snapshot = None
+def main():
+    """Main loop: take an initial snapshot and check periodically for changes. For many playlists, see watcher.py."""
+    last_snapshot = None
+    last_snapshot_id = None
 
-while True:
-    current_snapshot, tracks = get_playlist_snapshot()
-    
-    # Compare snapshots; if they differ, update the playlist description.
-    if current_snapshot != last_snapshot:
-        update_playlist_description(tracks)
-        last_snapshot = current_snapshot
-    else:
-        print("No changes detected.")
-    
-    # Wait for 60 seconds before checking again (adjust as needed)
-    time.sleep(60)
+    while True:
+        # Nothing changed since the last full listing, skip paging through every track.
+        if CHANGE_DETECTION == 'snapshot_id':
+            snapshot_id = get_snapshot_id()
+            if snapshot_id == last_snapshot_id:
+                print("No changes detected.")
+                time.sleep(POLL_SECONDS)
+                continue
+            last_snapshot_id = snapshot_id
+
+        current_snapshot, tracks = get_playlist_snapshot()
+        
+        # Compare snapshots; if they differ, update the playlist description.
+        # Updating the description bumps snapshot_id too, the hash catches that nothing else changed.
+        if current_snapshot != last_snapshot:
+            update_playlist_description(tracks)
+            last_snapshot = current_snapshot
+        else:
+            print("No changes detected.")
+        
+        # Wait before checking again (adjust POLL_SECONDS as needed)
+        time.sleep(POLL_SECONDS)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+import argparse
+import asyncio
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import requests
+import urllib3
+from spotipy.exceptions import SpotifyException
+
+from spotplaylist import make_client, get_snapshot_id, get_playlist_snapshot, update_playlist_description
+
+# Watches many playlists from one process, sharing one authenticated client.
+# usage: python watcher.py watch.json
+# watch.json:
+#   {"max_concurrency": 4, "min_interval": 30, "max_interval": 1800,
+#    "playlists": ["7IiYMwxKoXoM9YOtodr5fA", {"id": "37i9dQZF1DXcBWIGoYBM5M", "min_interval": 10}]}
+
+DEFAULTS = {
+    "max_concurrency": 4,   # Spotify requests in flight at once, across every playlist
+    "min_interval": 30,     # seconds between polls right after a change
+    "max_interval": 1800,   # seconds between polls once a playlist has been idle a while
+    "backoff": 1.5,         # interval grows by this much after every idle poll
+}
+PER_PLAYLIST = ("min_interval", "max_interval", "backoff")
+DEFAULT_RETRY_AFTER = 5
+MAX_RATE_LIMITS = 5  # 429s in a row before a call gives up and its playlist reports the error
+
+def make_session():
+    """
+    A requests session that retries 5xxs but hands every 429 straight back. urllib3 otherwise
+    retries any 429 with a Retry-After on its own, sleeping on a worker thread while the
+    other playlists keep going. Once the 5xx retries run out the last response is returned
+    as is, so spotipy raises it as that 5xx and not as a header-less 429.
+    """
+    session = requests.Session()
+    retry = urllib3.Retry(total=3, connect=None, read=False, status=3, backoff_factor=0.3,
+                          allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+                          status_forcelist=(500, 502, 503, 504), respect_retry_after_header=False,
+                          raise_on_status=False)
+    adapter = requests.adapters.HTTPAdapter(max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def load_config(path):
+    """Returns (settings, playlists), each playlist a dict of PlaylistWatch arguments."""
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    settings = dict(DEFAULTS, **{k: v for k, v in config.items() if k != 'playlists'})
+    playlists = []
+    for entry in config['playlists']:
+        entry = {'id': entry} if isinstance(entry, str) else dict(entry)
+        playlist = {k: settings[k] for k in PER_PLAYLIST}
+        playlist.update({k: v for k, v in entry.items() if k in PER_PLAYLIST})
+        playlist['playlist_id'] = entry['id']
+        playlists.append(playlist)
+    return settings, playlists
+
+def retry_after(headers):
+    """Seconds Spotify asked us to wait, from a 429's headers."""
+    value = (headers or {}).get('Retry-After')
+    try:
+        return max(float(value), 1)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+class Scheduler:
+    """
+    Runs Spotify calls for every watcher on one shared client. spotipy blocks, so calls
+    go to a thread pool, with at most max_concurrency in flight. A 429 pauses every
+    playlist until its Retry-After, since the rate limit is per app, not per playlist.
+    """
+    def __init__(self, client, max_concurrency=4):
+        self.client = client
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.limit = asyncio.Semaphore(max_concurrency)
+        self.resume_at = 0.0
+        self.calls = 0
+        self.rate_limited = 0
+
+    async def call(self, fn, *args):
+        """fn(*args, client=...) on the pool, retried after a 429 up to MAX_RATE_LIMITS times."""
+        loop = asyncio.get_running_loop()
+        limited = 0
+        while True:
+            wait = self.resume_at - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            async with self.limit:
+                if self.resume_at > loop.time():
+                    continue  # another call got limited while we queued
+                self.calls += 1
+                try:
+                    return await loop.run_in_executor(self.executor, partial(fn, *args, client=self.client))
+                except SpotifyException as e:
+                    # a real 429 comes with headers, spotipy's own "Max Retries" 429 doesn't
+                    if e.http_status != 429 or not e.headers or limited == MAX_RATE_LIMITS:
+                        raise
+                    limited += 1
+                    delay = retry_after(e.headers)
+                    self.rate_limited += 1
+                    if loop.time() + delay > self.resume_at:
+                        self.resume_at = loop.time() + delay
+                        print(f"⏳ Rate limited, pausing every playlist for {delay:.0f}s")
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class PlaylistWatch:
+    """
+    One playlist's state between polls. The interval tightens to min_interval after a
+    change and grows by backoff after every idle poll, up to max_interval.
+    """
+    def __init__(self, playlist_id, min_interval=30, max_interval=1800, backoff=1.5):
+        self.playlist_id = playlist_id
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.snapshot_id = None
+        self.snapshot = None
+
+    def changed(self):
+        self.interval = self.min_interval
+
+    def idle(self):
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+
+async def poll(scheduler, watch):
+    """Checks one playlist, updating its description if its tracks changed. Returns True if they did."""
+    # One tiny request when nothing changed, see spotplaylist.get_snapshot_id.
+    snapshot_id = await scheduler.call(get_snapshot_id, watch.playlist_id)
+    if snapshot_id == watch.snapshot_id:
+        return False
+
+    snapshot, tracks = await scheduler.call(get_playlist_snapshot, watch.playlist_id)
+    if snapshot == watch.snapshot:
+        watch.snapshot_id = snapshot_id
+        return False  # only the description changed, probably our own update
+    await scheduler.call(update_playlist_description, tracks, watch.playlist_id)
+    # Only remembered once the update's gone through, so a failed one is retried next poll.
+    watch.snapshot_id, watch.snapshot = snapshot_id, snapshot
+    return True
+
+async def watch_playlist(scheduler, watch):
+    # Spread the first polls out, so hundreds of playlists don't all start at once.
+    await asyncio.sleep(random.uniform(0, watch.min_interval))
+    while True:
+        try:
+            changed = await poll(scheduler, watch)
+        except SpotifyException as e:
+            # Deleted, private or otherwise broken, check back rarely.
+            print(f"❌ {watch.playlist_id}: Spotify error {e.http_status}, {e.msg}")
+            watch.interval = watch.max_interval
+        except requests.RequestException as e:
+            print(f"❌ {watch.playlist_id}: Network error, {e}")
+            watch.idle()
+        else:
+            watch.changed() if changed else watch.idle()
+        # A little jitter, so playlists on the same interval drift apart.
+        await asyncio.sleep(watch.interval * random.uniform(0.9, 1.1))
+
+async def run(settings, playlists, client=None):
+    # 429s are handled by the Scheduler, so neither spotipy nor urllib3 may retry them on their own.
+    client = client or make_client(requests_session=make_session(), requests_timeout=10)
+    scheduler = Scheduler(client, settings['max_concurrency'])
+    watches = [PlaylistWatch(**playlist) for playlist in playlists]
+    print(f"👀 Watching {len(watches)} playlists, at most {settings['max_concurrency']} requests at a time")
+    try:
+        await asyncio.gather(*(watch_playlist(scheduler, watch) for watch in watches))
+    finally:
+        scheduler.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep many playlists' descriptions up to date.")
+    parser.add_argument("config", nargs="?", default="watch.json", help="JSON file listing the playlists")
+    args = parser.parse_args()
+    settings, playlists = load_config(args.config)
+    try:
+        asyncio.run(run(settings, playlists))
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+if __name__ == '__main__':
+    main()